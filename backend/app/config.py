@@ -12,7 +12,41 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# Optional pool of tokens (comma separated); falls back to the single GITHUB_TOKEN
+GITHUB_TOKENS = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()] or [GITHUB_TOKEN]
+GITHUB_INTERACTIVE_MAX_WAIT = float(os.getenv("GITHUB_INTERACTIVE_MAX_WAIT", "30"))
+GITHUB_CONCURRENCY = int(os.getenv("GITHUB_CONCURRENCY", "10"))
+GITHUB_ANALYSIS_MODE = os.getenv("GITHUB_ANALYSIS_MODE", "rest").lower()  # rest | graphql
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+REPO_CACHE_TTL_DAYS = float(os.getenv("REPO_CACHE_TTL_DAYS", "30"))
+GITHUB_HTTP_CACHE_TTL_DAYS = float(os.getenv("GITHUB_HTTP_CACHE_TTL_DAYS", "30"))
+REPO_CACHE_MAX_ENTRIES = int(os.getenv("REPO_CACHE_MAX_ENTRIES", "50000"))
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0 = thread fallback
+RESUME_QUEUE_LIMIT = int(os.getenv("RESUME_QUEUE_LIMIT", "32"))
+RESUME_EXTRACTION_TIMEOUT = float(os.getenv("RESUME_EXTRACTION_TIMEOUT", "60"))
+RESUME_TABLE_BACKEND = os.getenv("RESUME_TABLE_BACKEND", "layout").lower()  # layout | tabula | off
+RESUME_TABLE_TIMEOUT = float(os.getenv("RESUME_TABLE_TIMEOUT", "20"))
+RESUME_MAX_UPLOAD_MB = float(os.getenv("RESUME_MAX_UPLOAD_MB", "10"))
+RESUME_CACHE_TTL_DAYS = float(os.getenv("RESUME_CACHE_TTL_DAYS", "90"))
+RESUME_PROMPT_TOKEN_BUDGET = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "1000"))
+# Local tiktoken cache, filled by scripts/prewarm_tokenizer.py (never downloaded at runtime)
+TOKENIZER_CACHE_DIR = os.getenv("TOKENIZER_CACHE_DIR", "tokenizer_cache")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "64"))
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_ENDPOINT_CONCURRENCY = int(os.getenv("LLM_ENDPOINT_CONCURRENCY", "4"))
+# Per-endpoint overrides, e.g. "resume_analysis=2,nlq=4"
+LLM_ENDPOINT_LIMITS = {
+    name.strip(): int(limit)
+    for name, _, limit in (item.partition("=") for item in os.getenv("LLM_ENDPOINT_LIMITS", "").split(","))
+    if name.strip() and limit.strip()
+}
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+COMPANY_MATCH_TOP_K = int(os.getenv("COMPANY_MATCH_TOP_K", "8"))
+COMPANY_MATCH_NEAR_MISSES = int(os.getenv("COMPANY_MATCH_NEAR_MISSES", "4"))
+COMPANY_MATCH_PROMPT_TOKEN_BUDGET = int(os.getenv("COMPANY_MATCH_PROMPT_TOKEN_BUDGET", "600"))
 
 if not MONGO_URI or not DB_NAME:
     raise Exception("MONGO_URI or DB_NAME missing in .env")
@@ -11,3 +11,10 @@ admins_collection = db["admins"]
 companies_collection = db["companies"]
 benchmarks_collection = db["benchmarks"]
 training_collection = db["training_recommendations"]
+github_http_cache_collection = db["github_http_cache"]
+job_checkpoints_collection = db["job_checkpoints"]
+repo_analysis_cache_collection = db["repo_analysis_cache"]
+resume_extraction_cache_collection = db["resume_extraction_cache"]
+llm_response_cache_collection = db["llm_response_cache"]
+# Small shared counters, e.g. {"_id": "companies_catalog", "version": n}
+app_meta_collection = db["app_meta"]
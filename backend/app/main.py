@@ -1,10 +1,32 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import RESUME_MAX_UPLOAD_MB
+
 from app.routes import auth_routes, student_routes, admin_routes, nlq_routes
+from app.services.github_cache import ensure_github_cache_indexes
+from app.services.github_transport import close_github_client
+from app.services.repo_cache import ensure_repo_cache_indexes
+from app.services.resume_cache import ensure_resume_cache_indexes
+from app.services.llm_cache import ensure_llm_cache_indexes
+from app.services.llm_gateway import close_llm_client
+from app.services.extraction_pool import start_extraction_pool, shutdown_extraction_pool
+from app.services.table_extraction import start_table_backend, shutdown_table_backend
+from app.utils.tokenizer import load_tokenizer
+from app.utils.upload_stream import UploadSizeLimitMiddleware
 
 app = FastAPI(title="CampusIQ Backend")
 
+# Resume uploads: reject oversized bodies before the multipart form is spooled.
+# Added before CORS so CORS wraps it and the 413 carries CORS headers
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    paths=["/api/student/upload-resume", "/api/student/resume-pipeline"],
+    max_bytes=int(RESUME_MAX_UPLOAD_MB * 1024 * 1024),
+)
+
 # CORS (allow frontend / test html)
 app.add_middleware(
     CORSMiddleware,
@@ -24,3 +46,23 @@ app.include_router(nlq_routes.router, prefix="/api/admin", tags=["Admin"])
 @app.get("/")
 def root():
     return {"message": "CampusIQ Backend Running"}
+
+
+@app.on_event("startup")
+async def startup():
+    await ensure_github_cache_indexes()
+    await ensure_repo_cache_indexes()
+    await ensure_resume_cache_indexes()
+    await ensure_llm_cache_indexes()
+    await start_extraction_pool()
+    await start_table_backend()
+    # Local cache only, off the event loop; prompt budgets need it before the first request
+    await asyncio.to_thread(load_tokenizer)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_github_client()
+    await close_llm_client()
+    shutdown_extraction_pool()
+    shutdown_table_backend()
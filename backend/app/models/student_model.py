@@ -22,10 +22,13 @@ class StudentLogin(BaseModel):
 class ResumeData(BaseModel):
     file_name: str
     uploaded_at: str
+    content_hash: Optional[str] = None
     raw_text: str
     tables: List[Dict] = []
     images_extracted: int = 0
+    images: List[Dict] = []
     sections_found: List[str] = []
+    section_outline: List[Dict] = []
     resume_score: int = 0
     ats_score: int = 0
     missing_sections: List[str] = []
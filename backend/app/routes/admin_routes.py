@@ -1,10 +1,28 @@
 from fastapi import APIRouter
 from app.database import students_collection, companies_collection, benchmarks_collection, training_collection
 from typing import Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, BackgroundTasks
 from app.database import students_collection
-from app.utils.auth_dependency import get_current_user
+from app.utils.auth_dependency import get_current_user, require_admin
 from app.services.groq_service import generate_batch_recommendations
+from app.services.github_cache import get_cache_stats
+from app.services.repo_cache import get_repo_cache_stats
+from app.services.llm_cache import get_llm_cache_stats, get_llm_cache_usage
+from app.services.company_match_cache import get_company_match_cache_stats
+from app.services.llm_gateway import get_llm_gateway_stats
+from app.services.company_match_prompt import get_company_match_prompt_stats
+from app.services.github_scheduler import scheduler as github_scheduler
+from app.services.github_transport import breaker as github_breaker
+from app.services.github_refresh_service import (
+    refresh_stale_github_analyses,
+    get_refresh_status,
+    is_refresh_active,
+)
+from app.services.resume_rescore_service import (
+    rescore_resumes,
+    get_rescore_status,
+    is_rescore_active,
+)
 
 router = APIRouter()
 
@@ -719,3 +737,104 @@ async def get_gap_analysis(current_user=Depends(get_current_user)):
         })
         
     return {"gap_analysis": result}
+
+@router.get("/github/cache-stats")
+async def github_cache_stats(current_user=Depends(get_current_user)):
+    """Hit/miss counters of the GitHub ETag and shared repo caches since process start."""
+    return {
+        "github_http_cache": get_cache_stats(),
+        "repo_analysis_cache": get_repo_cache_stats()
+    }
+
+
+@router.get("/llm/cache-stats")
+async def llm_cache_stats(current_user=Depends(get_current_user)):
+    """Hit/miss/byte counters since process start plus the LLM response cache's current size."""
+    return {
+        "llm_response_cache": get_llm_cache_stats(),
+        "usage": await get_llm_cache_usage(),
+        "company_match_analysis_cache": get_company_match_cache_stats()
+    }
+
+
+@router.get("/llm/gateway-stats")
+async def llm_gateway_stats(current_user=Depends(get_current_user)):
+    """Slots in use, queued callers, retries and rate-limit cooldown for Groq calls."""
+    return {"llm_gateway": get_llm_gateway_stats()}
+
+
+@router.get("/llm/prompt-stats")
+async def llm_prompt_stats(current_user=Depends(get_current_user)):
+    """
+    Company-match prompt sizes since process start; the before/after
+    comparison (`last`) is sampled from the most recent prompt only.
+    """
+    return {"company_match_prompt": get_company_match_prompt_stats()}
+
+
+@router.get("/github/scheduler-stats")
+async def github_scheduler_stats(current_user=Depends(get_current_user)):
+    """Token pool levels, queue depth and circuit-breaker state for GitHub calls."""
+    return {
+        "github_scheduler": github_scheduler.stats(),
+        "github_circuit_breaker": github_breaker.stats()
+    }
+
+
+@router.post("/github/refresh")
+async def trigger_github_refresh(
+    background_tasks: BackgroundTasks,
+    max_age_hours: float = 24,
+    concurrency: int = 4,
+    current_user=Depends(require_admin)
+):
+    """Starts (or resumes a crashed run of) the campus-wide GitHub refresh in the background."""
+    if is_refresh_active():
+        return {"message": "GitHub refresh already running", "status": await github_refresh_status(current_user)}
+
+    background_tasks.add_task(
+        refresh_stale_github_analyses,
+        max_age_hours=max_age_hours,
+        concurrency=concurrency
+    )
+    return {"message": "GitHub refresh started"}
+
+
+@router.get("/github/refresh")
+async def github_refresh_status(current_user=Depends(get_current_user)):
+    status = await get_refresh_status()
+    if not status:
+        return {"status": "never_run"}
+
+    if status.get("last_student_id") is not None:
+        status["last_student_id"] = str(status["last_student_id"])
+    return status
+
+
+@router.post("/resumes/rescore")
+async def trigger_resume_rescore(
+    background_tasks: BackgroundTasks,
+    concurrency: int = 4,
+    force: bool = False,
+    current_user=Depends(require_admin)
+):
+    """
+    Starts (or resumes a crashed run of) bulk resume re-scoring in the background.
+    Students whose resume, profile, prompt version and model are unchanged are skipped.
+    """
+    if is_rescore_active():
+        return {"message": "Resume re-scoring already running", "status": await resume_rescore_status(current_user)}
+
+    background_tasks.add_task(rescore_resumes, concurrency=concurrency, force=force)
+    return {"message": "Resume re-scoring started"}
+
+
+@router.get("/resumes/rescore")
+async def resume_rescore_status(current_user=Depends(get_current_user)):
+    status = await get_rescore_status()
+    if not status:
+        return {"status": "never_run"}
+
+    if status.get("last_student_id") is not None:
+        status["last_student_id"] = str(status["last_student_id"])
+    return status
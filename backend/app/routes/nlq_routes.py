@@ -15,6 +15,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from app.utils.auth_dependency import get_current_user
 from app.services.nlq_service import run_nlq_query
+from app.services.llm_gateway import LLMUnavailable
 
 router = APIRouter()
 
@@ -45,6 +46,10 @@ async def admin_ai_query(
             limit=body.limit,
         )
         return result
+    except LLMUnavailable as e:
+        # Groq saturated or rate limited — the admin can retry shortly
+        headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+        raise HTTPException(status_code=503, detail=str(e), headers=headers)
     except ValueError as e:
         # Validation or parsing errors — return 400 with a clear message
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,16 +1,35 @@
 import os
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+import json
+import asyncio
+import itertools
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Header
+from fastapi.responses import FileResponse, StreamingResponse
+from PIL import UnidentifiedImageError
 from datetime import datetime, timedelta, timezone
 
 from app.database import students_collection
 from app.utils.auth_dependency import get_current_user
+from app.utils.upload_stream import save_pdf_upload
 from app.models.student_model import StudentUpdate
-from app.services.github_service import analyze_github_profile
-
-from app.services.prs_service import calculate_prs
-from app.services.resume_service import process_resume_upload, analyze_resume_with_groq
+from app.services.github_service import run_github_analysis
+from app.services.github_scheduler import GitHubRateLimited
+from app.services.github_transport import GitHubUnavailable
+
+from app.services.resume_service import (
+    process_resume_upload, analyze_resume_with_groq, resume_analysis_key,
+    build_resume_document, resume_upload_summary, analysis_update_fields,
+    stored_resume_analysis, can_reuse_analysis, reupload_update_fields,
+    section_backfill_fields, prs_update_fields
+)
+from app.services.extraction_pool import ExtractionQueueFull, ExtractionTimeout
+from app.services.resume_images import get_thumbnail
+from app.services.resume_pipeline import start_resume_pipeline, get_pipeline_job
+from app.config import RESUME_MAX_UPLOAD_MB
 from app.database import companies_collection
 from app.services.company_match_service import match_student_with_companies
+from app.services.company_match_cache import (
+    get_catalog_version, company_match_fingerprint, get_cached_company_analysis, store_company_analysis
+)
 
 
 router = APIRouter()
@@ -69,11 +88,25 @@ async def analyze_my_github(user=Depends(get_current_user)):
         raise HTTPException(status_code=400, detail="GitHub URL not set in profile")
 
     try:
-        analysis = analyze_github_profile(github_url)
+        # Incremental: only repos pushed since the stored analysis are refetched
+        analysis = await run_github_analysis(github_url, previous=existing_analysis)
 
         # ✅ add last_updated inside analysis
         analysis["last_updated"] = datetime.now(timezone.utc).isoformat()
 
+    except GitHubRateLimited as e:
+        # Token pool exhausted: tell the client when to come back instead of a 500
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "message": "GitHub rate limit reached, analysis queued",
+                "queue_position": e.queue_position,
+                "eta_seconds": e.eta_seconds
+            },
+            headers={"Retry-After": str(e.eta_seconds)}
+        )
+    except GitHubUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,6 +121,7 @@ async def analyze_my_github(user=Depends(get_current_user)):
 @router.post("/upload-resume")
 async def upload_resume(
     file: UploadFile = File(...),
+    save_images: bool = True,
     user=Depends(get_current_user)
 ):
     email = user["email"]
@@ -104,36 +138,33 @@ async def upload_resume(
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     
     file_path = os.path.join(UPLOAD_DIR, f"{student['_id']}_{file.filename}")
-    
-    # Save PDF
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
-        
+
+    # Stream to disk (size-capped, PDF header checked) and hash on the way
+    content_hash = await save_pdf_upload(file, file_path, int(RESUME_MAX_UPLOAD_MB * 1024 * 1024))
+
+    # Same file as the current resume: keep its extraction and AI analysis
+    reupload_fields = reupload_update_fields(student, file.filename, content_hash)
+    if reupload_fields:
+        await students_collection.update_one({"email": email}, {"$set": reupload_fields})
+        return {
+            "message": "Resume unchanged, previous analysis kept",
+            "file_name": file.filename,
+            **resume_upload_summary(student["resume"]),
+            "reused": True
+        }
+
     # Process Resume
     try:
-        extraction_result = await process_resume_upload(file_path, str(student["_id"]))
+        extraction_result = await process_resume_upload(file_path, str(student["_id"]), content_hash, save_images)
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
+    except ExtractionTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
          raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
 
     # Create Resume Document
-    resume_data = {
-        "file_name": file.filename,
-        "uploaded_at": datetime.now(timezone.utc).isoformat(),
-        "raw_text": extraction_result["raw_text"],
-        "tables": extraction_result["tables"],
-        "images_extracted": extraction_result["images_extracted"],
-        "sections_found": [], # To be filled by AI later
-        "resume_score": 0,
-        "ats_score": 0,
-        "missing_sections": [],
-        "profile_resume_match_score": 0,
-        "profile_mismatches": [],
-        "suggestions": [],
-        "last_analyzed_at": None,
-        # Store contact info found via regex as validation metadata if needed
-        "contact_info": extraction_result["contact_info"] 
-    }
+    resume_data = build_resume_document(file.filename, content_hash, extraction_result)
 
     # Update Student
     await students_collection.update_one(
@@ -144,12 +175,102 @@ async def upload_resume(
     return {
         "message": "Resume uploaded successfully",
         "file_name": file.filename,
-        "raw_text_preview": extraction_result["raw_text"][:200] + "...",
-        "images_extracted": extraction_result["images_extracted"],
-        "tables_extracted": len(extraction_result["tables"])
+        **resume_upload_summary(resume_data),
+        "reused": extraction_result["cached"]
     }
 
 
+@router.post("/resume-pipeline")
+async def start_resume_pipeline_endpoint(
+    file: UploadFile = File(...),
+    save_images: bool = True,
+    user=Depends(get_current_user)
+):
+    """
+    Saves the PDF and starts extract -> sections -> analysis -> prs in the
+    background. Follow progress at /resume-pipeline/{job_id}/events (SSE).
+    """
+    email = user["email"]
+    student = await students_collection.find_one({"email": email}, {"password": 0})
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+
+    UPLOAD_DIR = "uploads/resumes/"
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.join(UPLOAD_DIR, f"{student['_id']}_{file.filename}")
+
+    content_hash = await save_pdf_upload(file, file_path, int(RESUME_MAX_UPLOAD_MB * 1024 * 1024))
+
+    job = start_resume_pipeline(student, file_path, file.filename, content_hash, save_images)
+
+    return {
+        "message": "Resume pipeline started",
+        "job_id": job.id,
+        "events_url": f"/api/student/resume-pipeline/{job.id}/events"
+    }
+
+
+def _get_own_job(job_id: str, email: str):
+    job = get_pipeline_job(job_id)
+    if not job or job.email != email:
+        raise HTTPException(status_code=404, detail="Pipeline job not found")
+    return job
+
+
+@router.get("/resume-pipeline/{job_id}")
+async def resume_pipeline_status(job_id: str, user=Depends(get_current_user)):
+    return _get_own_job(job_id, user["email"]).snapshot()
+
+
+@router.get("/resume-pipeline/{job_id}/events")
+async def resume_pipeline_events(
+    job_id: str,
+    last_event_id: int = Header(-1, alias="Last-Event-ID"),
+    user=Depends(get_current_user)
+):
+    job = _get_own_job(job_id, user["email"])
+    return StreamingResponse(
+        job.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/resume-images")
+async def list_resume_images(user=Depends(get_current_user)):
+    student = await students_collection.find_one({"email": user["email"]}, {"resume.images": 1})
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    return {"images": (student.get("resume") or {}).get("images", [])}
+
+
+@router.get("/resume-images/{digest}/thumbnail")
+async def resume_image_thumbnail(digest: str, size: int = 256, user=Depends(get_current_user)):
+    student = await students_collection.find_one({"email": user["email"]}, {"resume.images": 1})
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    # Only images that belong to the caller's resume
+    images = (student.get("resume") or {}).get("images", [])
+    image = next((img for img in images if img.get("digest") == digest), None)
+    if not image:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    try:
+        thumb_path = await asyncio.to_thread(get_thumbnail, digest, image["ext"], size)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Image file missing")
+    except (UnidentifiedImageError, OSError):
+        # Stored as extracted; some embedded formats (JBIG2, JPX, CMYK masks) don't decode
+        raise HTTPException(status_code=415, detail="Image format cannot be rendered as a thumbnail")
+
+    return FileResponse(thumb_path, media_type="image/png")
+
+
 @router.post("/analyze-resume")
 async def analyze_resume_endpoint(user=Depends(get_current_user)):
     email = user["email"]
@@ -163,22 +284,33 @@ async def analyze_resume_endpoint(user=Depends(get_current_user)):
     if not resume_data or not resume_data.get("raw_text"):
         raise HTTPException(status_code=400, detail="No resume found. Please upload one first.")
 
+    # Resumes uploaded before local section detection: detect from the text
+    section_fields = section_backfill_fields(resume_data)
+    if section_fields:
+        await students_collection.update_one({"email": email}, {"$set": section_fields})
+
+    # Same resume bytes + same profile as the last analysis: reuse it
+    analysis_key = resume_analysis_key(student, resume_data.get("content_hash"))
+    if can_reuse_analysis(resume_data, analysis_key):
+        return {
+            "message": "Resume unchanged, previous analysis reused",
+            "analysis": stored_resume_analysis(resume_data)
+        }
+
     # Call AI Service
     try:
-        analysis_result = await analyze_resume_with_groq(student, resume_data["raw_text"])
+        analysis_result = await analyze_resume_with_groq(
+            student, resume_data["raw_text"], resume_data.get("section_outline")
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI Analysis failed: {str(e)}")
 
     # Update Student Document
-    update_data = {
-        "resume.resume_score": analysis_result.get("resume_score", 0),
-        "resume.ats_score": analysis_result.get("ats_score", 0),
-        "resume.missing_sections": analysis_result.get("missing_sections", []),
-        "resume.profile_mismatches": analysis_result.get("profile_mismatches", []),
-        "resume.suggestions": analysis_result.get("improvement_suggestions", []),
-        "resume.last_analyzed_at": datetime.now(timezone.utc).isoformat()
-    }
-    
+    update_data = analysis_update_fields(analysis_result, analysis_key)
+
+    # Section coverage comes from the local detector, not the LLM
+    analysis_result["missing_sections"] = resume_data.get("missing_sections", [])
+
     # Store detected skills if any (optional, can merge with profile skills if wanted, but keeping separate for now)
     
     await students_collection.update_one(
@@ -222,23 +354,11 @@ async def calculate_student_prs(user=Depends(get_current_user)):
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    prs_result = calculate_prs(student)
+    prs_fields = prs_update_fields(student)
 
-    await students_collection.update_one(
-        {"email": email},
-        {"$set": {
-            "prs_score": prs_result["prs_score"],
-            "prs_level": prs_result["prs_level"],
-            "prs_breakdown": prs_result["breakdown"]
-        }}
-    )
+    await students_collection.update_one({"email": email}, {"$set": prs_fields})
 
-    return {
-        "message": "PRS calculated successfully",
-        "prs_score": prs_result["prs_score"],
-        "prs_level": prs_result["prs_level"],
-        "prs_breakdown": prs_result["breakdown"]
-    }
+    return {"message": "PRS calculated successfully", **prs_fields}
 
 @router.get("/company-match")
 async def company_match(user=Depends(get_current_user)):
@@ -251,8 +371,19 @@ async def company_match(user=Depends(get_current_user)):
     companies = await companies_collection.find({}).to_list(200)
 
     match_result = match_student_with_companies(student, companies)
+
+    # Profile and companies catalog unchanged since the last analysis: reuse it
+    fingerprint = company_match_fingerprint(student, await get_catalog_version())
+    ai_analysis = get_cached_company_analysis(student, fingerprint)
+    if ai_analysis is not None:
+        return {
+            "message": "Company matching completed",
+            "company_matches": match_result["matches"],
+            "ai_analysis": ai_analysis,
+            "ai_cached": True
+        }
     
-    # Get AI analysis from Groq (no caching - fresh analysis every time)
+    # Get AI analysis from Groq (identical profile + matches are served from the LLM cache)
     from app.services.groq_service import analyze_company_matches_with_groq
     
     try:
@@ -269,13 +400,72 @@ async def company_match(user=Depends(get_current_user)):
             "error": str(e)
         }
 
+    await store_company_analysis(email, fingerprint, ai_analysis)
+
     return {
         "message": "Company matching completed",
         "company_matches": match_result["matches"],
-        "ai_analysis": ai_analysis
+        "ai_analysis": ai_analysis,
+        "ai_cached": False
     }
 
 
+@router.get("/company-match/stream")
+async def company_match_stream(user=Depends(get_current_user)):
+    """
+    Streaming variant of /company-match over Server-Sent Events:
+      matches  -> the deterministic company matches, sent immediately
+      insight  -> one per company, as soon as the AI has written it
+      analysis -> the complete AI analysis (replayed with its insights when the
+                  stored analysis still matches the profile and catalog)
+      error    -> AI analysis failed (carries the fallback ai_analysis)
+      done
+    """
+    email = user["email"]
+
+    student = await students_collection.find_one({"email": email}, {"password": 0})
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    companies = await companies_collection.find({}).to_list(200)
+
+    match_result = match_student_with_companies(student, companies)
+    fingerprint = company_match_fingerprint(student, await get_catalog_version())
+    cached_analysis = get_cached_company_analysis(student, fingerprint)
+
+    from app.services.groq_service import stream_company_match_insights, company_match_error
+
+    async def events():
+        event_ids = itertools.count()
+
+        def frame(event: str, data) -> str:
+            return f"id: {next(event_ids)}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+        yield frame("matches", {"company_matches": match_result["matches"]})
+
+        if cached_analysis is not None:
+            for insight in cached_analysis.get("company_insights", []):
+                yield frame("insight", insight)
+            yield frame("analysis", cached_analysis)
+            yield frame("done", {})
+            return
+
+        try:
+            async for event, data in stream_company_match_insights(student, match_result["matches"]):
+                if event == "analysis":
+                    await store_company_analysis(email, fingerprint, data)
+                yield frame(event, data)
+        except Exception as e:
+            yield frame("error", {"message": str(e), "ai_analysis": company_match_error(str(e))})
+        yield frame("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/analyze/github-detailed")
 async def analyze_github_detailed(user=Depends(get_current_user)):
     email = user["email"]
@@ -306,8 +496,8 @@ async def analyze_github_detailed(user=Depends(get_current_user)):
     from app.services.groq_service import analyze_github_with_groq
 
     try:
-        # Run Groq analysis
-        groq_analysis = await analyze_github_with_groq(github_analysis)
+        # Run Groq analysis; with no stored analysis (first run or cache cleared) ask Groq afresh
+        groq_analysis = await analyze_github_with_groq(github_analysis, refresh=not existing_groq_analysis)
         
         # Add timestamp
         groq_analysis["last_updated"] = datetime.now(timezone.utc).isoformat()
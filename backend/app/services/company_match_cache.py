@@ -0,0 +1,89 @@
+"""
+company_match_cache.py — per-student cache of the company-match AI analysis.
+
+The analysis only depends on what the prompt sees, so it is stored on the
+student (`company_match_analysis`) under a fingerprint of:
+
+  - branch, year, cgpa, sorted skills, prs_score
+  - the GitHub summary the prompt uses (score, top languages, repos, activity)
+  - the companies catalog version (`app_meta`, bumped whenever the catalog is
+    reseeded), the prompt version and the model
+
+Dashboard views and refreshes reuse the stored analysis until one of those
+changes. Failed analyses are never stored.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.config import GROQ_MODEL
+from app.database import app_meta_collection, students_collection
+from app.services.company_match_prompt import COMPANY_MATCH_PROMPT_VERSION
+
+CATALOG_META_ID = "companies_catalog"
+
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def get_company_match_cache_stats() -> Dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+async def get_catalog_version() -> int:
+    doc = await app_meta_collection.find_one({"_id": CATALOG_META_ID})
+    return (doc or {}).get("version", 0)
+
+
+def company_match_fingerprint(student: Dict, catalog_version: int) -> str:
+    github_analysis = student.get("github_analysis") or {}
+    material = json.dumps(
+        {
+            "prompt": COMPANY_MATCH_PROMPT_VERSION,
+            "model": GROQ_MODEL,
+            "catalog": catalog_version,
+            "branch": student.get("branch"),
+            "year": student.get("year"),
+            "cgpa": student.get("cgpa"),
+            "skills": sorted({s.strip().lower() for s in student.get("skills", [])}),
+            "prs_score": student.get("prs_score"),
+            "github": [
+                github_analysis.get("github_score", 0),
+                (github_analysis.get("top_languages") or [])[:5],
+                github_analysis.get("public_repos", 0),
+                (github_analysis.get("activity_summary") or {}).get("commits_last_90_days_estimated", 0),
+            ],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_cached_company_analysis(student: Dict, fingerprint: str) -> Optional[Dict]:
+    """The stored ai_analysis if it was produced for this fingerprint."""
+    cached = student.get("company_match_analysis") or {}
+    if cached.get("fingerprint") == fingerprint and cached.get("ai_analysis"):
+        _stats["hits"] += 1
+        return cached["ai_analysis"]
+    _stats["misses"] += 1
+    return None
+
+
+async def store_company_analysis(email: str, fingerprint: str, ai_analysis: Dict):
+    if ai_analysis.get("error"):
+        return
+    await students_collection.update_one(
+        {"email": email},
+        {"$set": {"company_match_analysis": {
+            "fingerprint": fingerprint,
+            "ai_analysis": ai_analysis,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }}}
+    )
+    _stats["stores"] += 1
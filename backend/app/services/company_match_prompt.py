@@ -0,0 +1,126 @@
+"""
+company_match_prompt.py — compact company table for the company-match analysis.
+
+Instead of `json.dumps(matches, indent=2)` for every company in the catalog,
+the prompt gets:
+
+  1. the top COMPANY_MATCH_TOP_K eligible companies by match percent
+  2. the COMPANY_MATCH_NEAR_MISSES ineligible companies closest to
+     eligibility (fewest failed criteria, then fewest missing skills), which
+     is where improvement advice pays off; if fewer companies are eligible the
+     free slots go to more near misses
+  3. encoded as a table with the column names once and one `|`-separated row
+     per company, instead of repeating every key per company
+  4. packed into COMPANY_MATCH_PROMPT_TOKEN_BUDGET tokens (app.utils.tokenizer,
+     a regex estimate until the tokenizer is loaded; the stats say which),
+     best rows first
+
+Reported at /admin/llm/prompt-stats, per process:
+  - every prompt: counted in `prompts`, `tokens_after`, `companies_total`
+    and `companies_kept`
+  - before/after is sampled, not recorded per prompt: `last` holds the most
+    recent prompt only, and what the legacy JSON would have cost is tokenized
+    for it when the stats are read, so building a prompt never pays for the
+    old format
+"""
+
+import json
+from typing import Dict, List
+
+from app.config import (
+    COMPANY_MATCH_TOP_K, COMPANY_MATCH_NEAR_MISSES, COMPANY_MATCH_PROMPT_TOKEN_BUDGET
+)
+from app.utils.tokenizer import count_tokens, is_estimate, tokenizer_name
+
+# Bump when the company-match prompt changes so cached analyses are recomputed
+COMPANY_MATCH_PROMPT_VERSION = 1
+
+COLUMNS = "company|role|tier|eligible|match%|min_cgpa|cgpa_ok|branch_ok|missing_required_skills"
+# Missing skills listed per row before collapsing the rest into "+N"
+MAX_MISSING_SKILLS = 4
+
+_stats: Dict[str, int] = {"prompts": 0, "tokens_after": 0, "companies_total": 0, "companies_kept": 0}
+_last: Dict = {}
+# Matches behind the most recent prompt, tokenized as legacy JSON on demand
+_last_matches: List[Dict] = []
+
+
+def get_company_match_prompt_stats() -> Dict:
+    if _last and "tokens_before" not in _last:
+        before = count_tokens(json.dumps(_last_matches, indent=2))
+        _last["tokens_before"] = before
+        _last["saved_ratio"] = round(1 - _last["tokens_after"] / before, 3) if before else 0.0
+    return {
+        **_stats,
+        "tokenizer": tokenizer_name(),
+        "estimated": is_estimate(),
+        # tokens_before / saved_ratio: sampled from the most recent prompt only
+        "last": _last,
+    }
+
+
+def _flag(value) -> str:
+    return "Y" if value else "N"
+
+
+def _row(match: Dict) -> str:
+    missing = match.get("missing_required_skills") or []
+    shown = ", ".join(missing[:MAX_MISSING_SKILLS])
+    if len(missing) > MAX_MISSING_SKILLS:
+        shown += f" +{len(missing) - MAX_MISSING_SKILLS}"
+    return "|".join(str(v) for v in (
+        match.get("company_name"),
+        match.get("role") or "-",
+        match.get("tier") or "-",
+        _flag(match.get("eligible")),
+        match.get("match_percent", 0),
+        match.get("cgpa_required", 0),
+        _flag(match.get("cgpa_ok")),
+        _flag(match.get("branch_allowed")),
+        shown or "-",
+    ))
+
+
+def _miss_distance(match: Dict):
+    failed = (not match.get("branch_allowed")) + (not match.get("cgpa_ok")) + bool(match.get("missing_required_skills"))
+    return (failed, len(match.get("missing_required_skills") or []), -match.get("match_percent", 0))
+
+
+def select_companies(company_matches: List[Dict], top_k: int = COMPANY_MATCH_TOP_K, near_misses: int = COMPANY_MATCH_NEAR_MISSES) -> List[Dict]:
+    """Top eligible matches followed by the nearest misses, best first."""
+    eligible = sorted(
+        (m for m in company_matches if m.get("eligible")),
+        key=lambda m: m.get("match_percent", 0), reverse=True
+    )[:top_k]
+    misses = sorted((m for m in company_matches if not m.get("eligible")), key=_miss_distance)
+    return eligible + misses[:near_misses + top_k - len(eligible)]
+
+
+def build_company_table(company_matches: List[Dict], budget: int = COMPANY_MATCH_PROMPT_TOKEN_BUDGET) -> Dict:
+    """Returns {"text", "tokens_after", "tokenizer", "companies_total", "companies_kept"}."""
+    remaining = budget - count_tokens(COLUMNS) - 1
+    rows = []
+    for match in select_companies(company_matches):
+        row = _row(match)
+        cost = count_tokens(row) + 1  # newline
+        if cost > remaining:
+            break
+        rows.append(row)
+        remaining -= cost
+
+    text = "\n".join([COLUMNS] + rows)
+    result = {
+        "text": text,
+        "tokens_after": count_tokens(text),
+        "tokenizer": tokenizer_name(),
+        "companies_total": len(company_matches),
+        "companies_kept": len(rows),
+    }
+
+    _stats["prompts"] += 1
+    for key in ("tokens_after", "companies_total", "companies_kept"):
+        _stats[key] += result[key]
+    _last.clear()
+    _last.update({k: v for k, v in result.items() if k != "text"})
+    _last_matches[:] = company_matches
+    return result
@@ -0,0 +1,236 @@
+"""
+extraction_pool.py — process pool for CPU-bound resume extraction.
+
+PDF parsing holds the GIL, so running it through `asyncio.to_thread` stalls
+every other request during upload bursts. Extraction jobs run here instead:
+
+  - a ProcessPoolExecutor of RESUME_WORKERS processes, started at app startup
+    with the PDF libraries already imported (no cold import on the first job)
+  - a bounded queue: at most RESUME_WORKERS + RESUME_QUEUE_LIMIT jobs are
+    admitted, further uploads get `ExtractionQueueFull` immediately; admitted
+    jobs wait here (not in the executor) until a worker is free, so a job is
+    only handed to the pool when it can start right away
+  - a per-job timeout (RESUME_EXTRACTION_TIMEOUT) that starts when the job
+    starts, checked between pages inside the worker and enforced by the
+    caller; a worker stuck inside a single page is terminated and the pool
+    replaced, and jobs killed along with it are retried once on the new pool
+  - cancellation: if the request goes away, a queued job is dropped; a running
+    one keeps its worker slot until it finishes
+  - workers are spawned, not forked: the parent may already be running the
+    tabula JVM (table_extraction), which does not survive a fork
+
+RESUME_WORKERS=0 falls back to a worker thread (useful for local development).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from app.config import RESUME_WORKERS, RESUME_QUEUE_LIMIT, RESUME_EXTRACTION_TIMEOUT
+
+# Extra time the caller waits beyond the in-worker deadline before giving up on the worker
+TIMEOUT_GRACE_SECONDS = 5.0
+
+_pool: Optional[ProcessPoolExecutor] = None
+# One permit per worker: jobs queue on this, so time in the queue never counts against a job's timeout
+_worker_slots: Optional[asyncio.Semaphore] = None
+_in_flight = 0
+_stats: Dict[str, int] = {"completed": 0, "rejected": 0, "timed_out": 0, "cancelled": 0, "failed": 0}
+
+
+class ExtractionQueueFull(Exception):
+    """Too many resume extractions are queued; retry later."""
+
+
+class ExtractionTimeout(Exception):
+    """A resume extraction took longer than RESUME_EXTRACTION_TIMEOUT."""
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+def _warm_worker():
+    # Preload the heavy libraries once per process
+    import fitz  # noqa: F401
+    import app.services.pdf_extraction  # noqa: F401
+
+    # Workers must not react to Ctrl+C; the parent shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _ping() -> int:
+    # Held briefly so concurrent pings land on (and spawn) distinct workers
+    time.sleep(0.1)
+    return os.getpid()
+
+
+def _run_extraction(file_path: str, image_dir: str, timeout: float, options: Dict[str, bool]) -> Dict[str, Any]:
+    from app.services.pdf_extraction import extract_resume_pdf
+
+    try:
+        return extract_resume_pdf(file_path, image_dir, deadline=time.monotonic() + timeout, **options)
+    except TimeoutError:
+        raise ExtractionTimeout(f"Resume extraction exceeded {timeout:.0f}s")
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=RESUME_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+    return _pool
+
+
+def _get_worker_slots() -> asyncio.Semaphore:
+    global _worker_slots
+    if _worker_slots is None:
+        _worker_slots = asyncio.Semaphore(RESUME_WORKERS)
+    return _worker_slots
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drops `pool` (broken or holding a stuck worker) unless it was already replaced."""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    # A worker stuck inside a page never reaches its deadline check; terminate it
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def start_extraction_pool():
+    """Spawns and warms every worker so the first uploads don't pay for it."""
+    if RESUME_WORKERS <= 0:
+        return
+    pool = _get_pool()
+    loop = asyncio.get_running_loop()
+    try:
+        pids = await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(RESUME_WORKERS)))
+        print(f"Resume extraction pool ready: {len(set(pids))} workers")
+    except Exception as e:
+        print(f"Resume extraction pool warm-up failed: {e}")
+
+
+def shutdown_extraction_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def get_extraction_pool_stats() -> Dict:
+    return {
+        **_stats,
+        "workers": RESUME_WORKERS,
+        "in_flight": _in_flight,
+        "capacity": max(RESUME_WORKERS, 1) + RESUME_QUEUE_LIMIT,
+    }
+
+
+async def run_extraction(
+    file_path: str,
+    image_dir: str,
+    with_tables: bool = True,
+    save_images: bool = True,
+) -> Dict[str, Any]:
+    """
+    Runs `extract_resume_pdf` in the pool.
+    Raises ExtractionQueueFull / ExtractionTimeout; other errors propagate.
+    """
+    global _in_flight
+
+    if _in_flight >= max(RESUME_WORKERS, 1) + RESUME_QUEUE_LIMIT:
+        _stats["rejected"] += 1
+        raise ExtractionQueueFull("Resume processing queue is full, please retry shortly")
+
+    options = {"with_tables": with_tables, "save_images": save_images}
+
+    _in_flight += 1
+    try:
+        if RESUME_WORKERS <= 0:
+            result = await _run_in_thread(file_path, image_dir, options)
+        else:
+            result = await _run_in_pool(file_path, image_dir, options)
+        _stats["completed"] += 1
+        return result
+    except ExtractionTimeout:
+        _stats["timed_out"] += 1
+        raise
+    except asyncio.CancelledError:
+        _stats["cancelled"] += 1
+        raise
+    except Exception:
+        _stats["failed"] += 1
+        raise
+    finally:
+        _in_flight -= 1
+
+
+async def _run_in_thread(file_path: str, image_dir: str, options: Dict[str, bool]) -> Dict[str, Any]:
+    from app.services.pdf_extraction import extract_resume_pdf
+
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(extract_resume_pdf, file_path, image_dir, **options),
+            RESUME_EXTRACTION_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        raise ExtractionTimeout(f"Resume extraction exceeded {RESUME_EXTRACTION_TIMEOUT:.0f}s")
+
+
+async def _run_in_pool(file_path: str, image_dir: str, options: Dict[str, bool]) -> Dict[str, Any]:
+    slots = _get_worker_slots()
+    await slots.acquire()
+    futures: List[Future] = []
+    try:
+        try:
+            return await _submit(file_path, image_dir, options, futures)
+        except BrokenProcessPool:
+            # Killed with a pool torn down for another job's stuck worker: retry once on the new pool
+            return await _submit(file_path, image_dir, options, futures)
+    finally:
+        running = futures[-1] if futures and not futures[-1].done() else None
+        if running is None:
+            slots.release()
+        else:
+            # Request went away mid-job: the worker stays busy until the job ends, and so does its slot
+            loop = asyncio.get_running_loop()
+            running.add_done_callback(lambda _: loop.call_soon_threadsafe(slots.release))
+
+
+async def _submit(file_path: str, image_dir: str, options: Dict[str, bool], futures: List[Future]) -> Dict[str, Any]:
+    pool = _get_pool()
+    try:
+        future = pool.submit(_run_extraction, file_path, image_dir, RESUME_EXTRACTION_TIMEOUT, options)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = _get_pool()
+        future = pool.submit(_run_extraction, file_path, image_dir, RESUME_EXTRACTION_TIMEOUT, options)
+    futures.append(future)
+
+    try:
+        # A worker slot was free, so the job starts now and this deadline matches the worker's.
+        # ExtractionTimeout raised by the in-worker deadline check propagates as is
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future),
+            RESUME_EXTRACTION_TIMEOUT + TIMEOUT_GRACE_SECONDS
+        )
+    except asyncio.TimeoutError:
+        # The running job never came back (stuck in native code): replace its pool
+        _discard_pool(pool)
+        raise ExtractionTimeout(f"Resume extraction exceeded {RESUME_EXTRACTION_TIMEOUT:.0f}s")
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
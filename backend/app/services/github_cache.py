@@ -0,0 +1,110 @@
+"""
+github_cache.py — persistent ETag / Last-Modified cache for GitHub REST calls.
+
+Every successful GET is stored in MongoDB with its validators. Subsequent
+requests send `If-None-Match` / `If-Modified-Since`; on a 304 the cached body
+is replayed as a normal 200 response. GitHub does not count 304s against
+the rate limit, so re-analysing unchanged repos is almost free.
+
+Entries expire GITHUB_HTTP_CACHE_TTL_DAYS after they were stored (TTL index
+on `stored_at`), so bodies of renamed or deleted repos don't pile up.
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from app.config import GITHUB_HTTP_CACHE_TTL_DAYS
+from app.database import github_http_cache_collection
+from app.services.github_scheduler import scheduled_request
+
+# In-process counters (reset on restart)
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+
+def cache_key(path: str, params: Optional[Dict] = None) -> str:
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted(params.items()))}"
+
+
+def get_cache_stats() -> Dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+async def ensure_github_cache_indexes():
+    try:
+        await github_http_cache_collection.create_index(
+            "stored_at",
+            expireAfterSeconds=int(GITHUB_HTTP_CACHE_TTL_DAYS * 86400)
+        )
+    except Exception as e:
+        print(f"GitHub cache index creation failed: {e}")
+
+
+async def conditional_get(
+    client: httpx.AsyncClient,
+    path: str,
+    params: Optional[Dict] = None
+) -> httpx.Response:
+    """
+    GET `path` with conditional headers from the cache.
+    Returns the live response, or a synthetic 200 built from the cached body on 304.
+    """
+    key = cache_key(path, params)
+
+    try:
+        cached = await github_http_cache_collection.find_one({"_id": key})
+    except Exception as e:
+        # Cache is best-effort: never fail a GitHub call because Mongo is unhappy
+        print(f"GitHub cache lookup failed: {e}")
+        _stats["errors"] += 1
+        cached = None
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    res = await scheduled_request(client, "GET", path, params=params, headers=headers)
+
+    if res.status_code == 304 and cached:
+        _stats["hits"] += 1
+        return httpx.Response(
+            200,
+            content=cached["body"].encode("utf-8"),
+            headers={"Content-Type": "application/json", **({"Link": cached["link"]} if cached.get("link") else {})},
+            request=res.request,
+        )
+
+    _stats["misses"] += 1
+
+    if res.status_code == 200 and (res.headers.get("ETag") or res.headers.get("Last-Modified")):
+        try:
+            await github_http_cache_collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "etag": res.headers.get("ETag"),
+                    "last_modified": res.headers.get("Last-Modified"),
+                    "body": res.text,
+                    # pagination header is part of the answer for count queries
+                    "link": res.headers.get("Link"),
+                    "stored_at": datetime.now(timezone.utc),
+                },
+                upsert=True,
+            )
+            _stats["stores"] += 1
+        except Exception as e:
+            print(f"GitHub cache store failed: {e}")
+            _stats["errors"] += 1
+
+    return res
@@ -0,0 +1,155 @@
+"""
+github_graphql_service.py — single-round-trip GitHub analysis via GraphQL v4.
+
+Fetches the user profile, the top N repos (by push date), their languages,
+README blobs and 90-day commit counts in ONE query, then reuses the REST
+analyzer's per-repo / aggregate builders so the returned dict is identical
+in shape to `github_service.analyze_github_profile`.
+
+The endpoint is configurable (`GITHUB_GRAPHQL_URL`) so the mode can be
+exercised against a local stub GraphQL server.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import GITHUB_GRAPHQL_URL
+from app.services.github_scheduler import scheduled_request
+from app.services.github_transport import get_github_client
+from app.services.github_service import (
+    REPO_LIMIT,
+    extract_github_username,
+    build_repo_entry,
+    build_github_analysis,
+)
+
+# README lookups: REST /readme resolves the file case-insensitively, GraphQL
+# needs an explicit path, so the common spellings are aliased and the first
+# non-null blob wins.
+README_PATHS = {
+    "readme_md": "HEAD:README.md",
+    "readme_md_lower": "HEAD:readme.md",
+    "readme_md_title": "HEAD:Readme.md",
+    "readme_rst": "HEAD:README.rst",
+    "readme_plain": "HEAD:README",
+}
+
+_README_FIELDS = "\n".join(
+    f'        {alias}: object(expression: "{expr}") {{ ... on Blob {{ text }} }}'
+    for alias, expr in README_PATHS.items()
+)
+
+PROFILE_QUERY = """
+query($login: String!, $first: Int!, $since: GitTimestamp!) {
+  user(login: $login) {
+    login
+    followers { totalCount }
+    following { totalCount }
+    repositories(
+      first: $first
+      ownerAffiliations: OWNER
+      privacy: PUBLIC
+      orderBy: {field: PUSHED_AT, direction: DESC}
+    ) {
+      totalCount
+      nodes {
+        name
+        description
+        pushedAt
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          nodes { name }
+        }
+%s
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(since: $since) { totalCount }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % _README_FIELDS
+
+
+async def fetch_profile_graphql(
+    username: str,
+    top_n: int = REPO_LIMIT,
+    days: int = 90,
+    client: Optional[httpx.AsyncClient] = None
+) -> Dict:
+    """Runs PROFILE_QUERY and returns the raw `user` node."""
+    client = client or get_github_client()
+    since_time = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+    res = await scheduled_request(
+        client,
+        "POST",
+        GITHUB_GRAPHQL_URL,
+        resource="graphql",
+        json={
+            "query": PROFILE_QUERY,
+            "variables": {"login": username, "first": top_n, "since": since_time},
+        },
+    )
+
+    if res.status_code != 200:
+        raise Exception(f"GitHub GraphQL fetch failed: {res.text}")
+
+    payload = res.json()
+    user = (payload.get("data") or {}).get("user")
+
+    if payload.get("errors") and not user:
+        raise Exception(f"GitHub user fetch failed: {payload['errors']}")
+    if not user:
+        raise Exception(f"GitHub user fetch failed: user '{username}' not found")
+
+    return user
+
+
+def _readme_text(node: Dict) -> str:
+    for alias in README_PATHS:
+        blob = node.get(alias)
+        if blob and blob.get("text"):
+            return blob["text"]
+    return ""
+
+
+def _commit_count(node: Dict) -> int:
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    return (target.get("history") or {}).get("totalCount", 0)
+
+
+async def analyze_github_profile_graphql(
+    github_url: str,
+    top_n: int = REPO_LIMIT,
+    client: Optional[httpx.AsyncClient] = None
+):
+    """GraphQL counterpart of `analyze_github_profile_async` (same output dict)."""
+    username = extract_github_username(github_url)
+    user = await fetch_profile_graphql(username, top_n=top_n, client=client)
+
+    repositories = user.get("repositories") or {}
+    user_data = {
+        "followers": (user.get("followers") or {}).get("totalCount", 0),
+        "following": (user.get("following") or {}).get("totalCount", 0),
+        "public_repos": repositories.get("totalCount", 0),
+    }
+
+    repo_analysis = []
+
+    for node in repositories.get("nodes") or []:
+        repo = {
+            "name": node["name"],
+            "description": node.get("description"),
+            "pushed_at": node.get("pushedAt"),
+        }
+        languages_used = [lang["name"] for lang in (node.get("languages") or {}).get("nodes") or []]
+
+        repo_analysis.append(build_repo_entry(repo, languages_used, _readme_text(node), _commit_count(node)))
+
+    return build_github_analysis(username, user_data, repo_analysis)
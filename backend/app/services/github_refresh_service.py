@@ -0,0 +1,159 @@
+"""
+github_refresh_service.py — campus-wide background refresh of `github_analysis`.
+
+Finds students whose GitHub analysis is missing or older than `max_age_hours`,
+re-analyses them (incrementally, at batch priority so interactive requests
+stay ahead) with bounded concurrency, recomputes PRS, and checkpoints progress
+in `job_checkpoints` so a crashed run resumes where it stopped.
+
+Run nightly via `python scripts/refresh_github.py` or trigger from the admin API.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from app.database import students_collection, job_checkpoints_collection
+from app.services.github_service import run_github_analysis
+from app.services.github_scheduler import github_priority, BATCH
+from app.services.resume_service import prs_update_fields
+
+DEFAULT_JOB_ID = "github_refresh"
+
+# Jobs currently running in this process (a "running" checkpoint without an
+# entry here is a crashed run waiting to be resumed)
+_active_jobs = set()
+
+
+def _stale_query(max_age_hours: float) -> Dict:
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=max_age_hours)).isoformat()
+    return {
+        "role": {"$ne": "admin"},
+        "github_url": {"$nin": [None, ""]},
+        "$or": [
+            {"github_analysis": None},
+            {"github_analysis.last_updated": {"$exists": False}},
+            # last_updated is stored as an ISO string in UTC, so it sorts lexically
+            {"github_analysis.last_updated": {"$lt": cutoff}},
+        ],
+    }
+
+
+async def get_refresh_status(job_id: str = DEFAULT_JOB_ID) -> Optional[Dict]:
+    return await job_checkpoints_collection.find_one({"_id": job_id})
+
+
+def is_refresh_active(job_id: str = DEFAULT_JOB_ID) -> bool:
+    return job_id in _active_jobs
+
+
+async def _refresh_student(student: Dict) -> bool:
+    try:
+        analysis = await run_github_analysis(
+            student["github_url"],
+            previous=student.get("github_analysis")
+        )
+    except Exception as e:
+        print(f"GitHub refresh failed for {student.get('email')}: {e}")
+        return False
+
+    student["github_analysis"] = analysis
+    await students_collection.update_one(
+        {"_id": student["_id"]},
+        {"$set": {"github_analysis": analysis, **prs_update_fields(student)}}
+    )
+    return True
+
+
+async def refresh_stale_github_analyses(
+    max_age_hours: float = 24,
+    concurrency: int = 4,
+    job_id: str = DEFAULT_JOB_ID,
+    limit: Optional[int] = None,
+    restart: bool = False
+) -> Dict:
+    """
+    Processes stale students in `_id` order. Progress is checkpointed after
+    every batch; an unfinished checkpoint is resumed unless `restart` is set.
+    """
+    if job_id in _active_jobs:
+        raise RuntimeError(f"{job_id} is already running")
+
+    _active_jobs.add(job_id)
+    try:
+        return await _run_refresh(max_age_hours, concurrency, job_id, limit, restart)
+    finally:
+        _active_jobs.discard(job_id)
+
+
+async def _run_refresh(
+    max_age_hours: float,
+    concurrency: int,
+    job_id: str,
+    limit: Optional[int],
+    restart: bool
+) -> Dict:
+    checkpoint = await get_refresh_status(job_id)
+    resume = checkpoint and checkpoint.get("status") == "running" and not restart
+
+    if resume:
+        print(f"Resuming {job_id} after student {checkpoint.get('last_student_id')}")
+    else:
+        checkpoint = {
+            "_id": job_id,
+            "status": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "last_student_id": None,
+            "processed": 0,
+            "succeeded": 0,
+            "failed": 0,
+        }
+        await job_checkpoints_collection.replace_one({"_id": job_id}, checkpoint, upsert=True)
+
+    projection = {"password": 0, "resume.raw_text": 0}
+    batch_size = max(1, concurrency)
+    semaphore = asyncio.Semaphore(batch_size)
+    run_started = time.monotonic()
+    run_processed = 0
+
+    async def limited(student):
+        async with semaphore:
+            return await _refresh_student(student)
+
+    with github_priority(BATCH):
+        while limit is None or run_processed < limit:
+            # Re-query per batch (keyed on _id) so no cursor stays open across slow GitHub calls
+            query = _stale_query(max_age_hours)
+            if checkpoint.get("last_student_id") is not None:
+                query["_id"] = {"$gt": checkpoint["last_student_id"]}
+
+            length = batch_size * 4 if limit is None else min(batch_size * 4, limit - run_processed)
+            batch = await students_collection.find(query, projection).sort("_id", 1).to_list(length=length)
+            if not batch:
+                break
+
+            results = await asyncio.gather(*[limited(s) for s in batch])
+            succeeded = sum(1 for ok in results if ok)
+            run_processed += len(batch)
+
+            elapsed = time.monotonic() - run_started
+            checkpoint["last_student_id"] = batch[-1]["_id"]
+            checkpoint["processed"] += len(batch)
+            checkpoint["succeeded"] += succeeded
+            checkpoint["failed"] += len(batch) - succeeded
+            checkpoint["throughput_per_min"] = round(run_processed / elapsed * 60, 2) if elapsed else 0.0
+            checkpoint["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+            await job_checkpoints_collection.replace_one({"_id": job_id}, checkpoint, upsert=True)
+            print(
+                f"[{job_id}] processed={checkpoint['processed']} "
+                f"failed={checkpoint['failed']} "
+                f"throughput={checkpoint['throughput_per_min']}/min"
+            )
+
+    checkpoint["status"] = "completed"
+    checkpoint["finished_at"] = datetime.now(timezone.utc).isoformat()
+    await job_checkpoints_collection.replace_one({"_id": job_id}, checkpoint, upsert=True)
+
+    return checkpoint
@@ -0,0 +1,285 @@
+"""
+github_scheduler.py — process-wide, rate-limit-aware scheduler for GitHub calls.
+
+Every GitHub request acquires a slot from a pool of tokens (GITHUB_TOKENS,
+comma separated, falls back to GITHUB_TOKEN). Each token is a token bucket per
+rate-limit resource (`core`, `graphql`, ...) whose level and refill time come
+from the `X-RateLimit-Remaining` / `X-RateLimit-Reset` headers.
+
+When every bucket is empty, callers wait in a priority queue per resource
+(a `search` bucket waiting on its reset never holds up ready `core` calls),
+each with its own wake-up timer at that resource's next reset: interactive
+requests (a student pressing "Analyze GitHub") are served before batch work
+(admin backfills, nightly refresh). Interactive callers that would wait longer
+than GITHUB_INTERACTIVE_MAX_WAIT get a `GitHubRateLimited` with their queue
+position and ETA instead of hanging.
+
+Priority is carried in a context variable so the fetch_* helpers do not need
+an extra argument:
+
+    with github_priority(BATCH):
+        await analyze_github_profile_async(url)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import GITHUB_TOKENS, GITHUB_INTERACTIVE_MAX_WAIT
+from app.services.github_transport import send
+
+INTERACTIVE = 0
+BATCH = 1
+
+_priority: ContextVar[int] = ContextVar("github_priority", default=INTERACTIVE)
+
+# Attempts per request when the chosen token turns out to be exhausted
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class GitHubRateLimited(Exception):
+    """All tokens are exhausted and the caller should come back later."""
+
+    def __init__(self, eta_seconds: float, queue_position: int):
+        self.eta_seconds = int(eta_seconds) + 1
+        self.queue_position = queue_position
+        super().__init__(
+            f"GitHub rate limit reached; queue position {queue_position}, "
+            f"retry in ~{self.eta_seconds}s"
+        )
+
+
+@contextmanager
+def github_priority(priority: int):
+    """Runs the enclosed GitHub calls (including spawned tasks) at `priority`."""
+    reset = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(reset)
+
+
+class _Bucket:
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self):
+        # Unknown until the first response headers arrive: assume available
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+
+    def available(self, now: float) -> bool:
+        if self.remaining is None or now >= self.reset_at:
+            return True
+        return self.remaining > 0
+
+
+class _Token:
+    def __init__(self, value: Optional[str]):
+        self.value = value
+        self.buckets: Dict[str, _Bucket] = {}
+
+    def bucket(self, resource: str) -> _Bucket:
+        if resource not in self.buckets:
+            self.buckets[resource] = _Bucket()
+        return self.buckets[resource]
+
+
+class GitHubScheduler:
+    def __init__(self, tokens: List[Optional[str]]):
+        self._tokens = [_Token(t) for t in (tokens or [None])]
+        # per resource: heap of (priority, seq, future)
+        self._waiters: Dict[str, List[Tuple[int, int, asyncio.Future]]] = {}
+        self._seq = itertools.count()
+        self._wakeups: Dict[str, asyncio.TimerHandle] = {}
+        self._stats = {"granted": 0, "queued": 0, "rejected": 0, "exhausted_responses": 0}
+
+    # ------------------------------------------------------------------
+    # Token selection
+    # ------------------------------------------------------------------
+    def _pick(self, resource: str) -> Optional[_Token]:
+        now = time.time()
+        best, best_remaining = None, -1
+
+        for token in self._tokens:
+            bucket = token.bucket(resource)
+            if not bucket.available(now):
+                continue
+            if bucket.remaining is None or now >= bucket.reset_at:
+                return token
+            if bucket.remaining > best_remaining:
+                best, best_remaining = token, bucket.remaining
+
+        return best
+
+    def _take(self, token: _Token, resource: str) -> _Token:
+        bucket = token.bucket(resource)
+        if bucket.remaining is not None and time.time() < bucket.reset_at:
+            bucket.remaining -= 1
+        self._stats["granted"] += 1
+        return token
+
+    def _next_reset(self, resource: str) -> float:
+        resets = [t.bucket(resource).reset_at for t in self._tokens]
+        return min(resets) if resets else time.time()
+
+    def _queue_position(self, priority: int, resource: str = "core") -> int:
+        return sum(1 for p, _, _ in self._waiters.get(resource, ()) if p <= priority) + 1
+
+    def estimate_wait(self, resource: str = "core", position: int = 1) -> float:
+        now = time.time()
+        capacity = 0
+        for token in self._tokens:
+            bucket = token.bucket(resource)
+            if bucket.remaining is None or now >= bucket.reset_at:
+                return 0.0
+            capacity += bucket.remaining
+        if position <= capacity:
+            return 0.0
+        return max(0.0, self._next_reset(resource) - now)
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+    async def acquire(self, resource: str = "core") -> _Token:
+        priority = _priority.get()
+
+        waiters = self._waiters.setdefault(resource, [])
+
+        # Fast path: a token is free and nobody of equal/higher priority is waiting for this resource
+        if not any(p <= priority for p, _, _ in waiters):
+            token = self._pick(resource)
+            if token:
+                return self._take(token, resource)
+
+        position = self._queue_position(priority, resource)
+        if priority == INTERACTIVE:
+            eta = self.estimate_wait(resource, position)
+            if eta > GITHUB_INTERACTIVE_MAX_WAIT:
+                self._stats["rejected"] += 1
+                raise GitHubRateLimited(eta, position)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(waiters, (priority, next(self._seq), future))
+        self._stats["queued"] += 1
+        self._schedule_wakeup(resource)
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            waiters[:] = [w for w in waiters if w[2] is not future]
+            heapq.heapify(waiters)
+            raise
+
+    def record(self, token: _Token, headers: httpx.Headers, resource: str = "core"):
+        """Updates the token's bucket from response headers and wakes waiters."""
+        resource = headers.get("X-RateLimit-Resource", resource)
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+
+        if remaining is not None and reset is not None:
+            bucket = token.bucket(resource)
+            bucket.remaining = int(remaining)
+            bucket.reset_at = float(reset)
+
+        self._drain()
+
+    def mark_exhausted(self, token: _Token, headers: httpx.Headers, resource: str = "core"):
+        bucket = token.bucket(headers.get("X-RateLimit-Resource", resource))
+        bucket.remaining = 0
+        reset = headers.get("X-RateLimit-Reset")
+        retry_after = headers.get("Retry-After")
+        if reset:
+            bucket.reset_at = float(reset)
+        elif retry_after:
+            bucket.reset_at = time.time() + float(retry_after)
+        else:
+            bucket.reset_at = time.time() + 60
+        self._stats["exhausted_responses"] += 1
+
+    def _drain(self):
+        for resource in list(self._waiters):
+            self._drain_resource(resource)
+
+    def _drain_resource(self, resource: str):
+        """Grants queued requests for `resource` in priority order until its buckets run dry."""
+        waiters = self._waiters.get(resource, [])
+        while waiters:
+            future = waiters[0][2]
+            if future.done():
+                heapq.heappop(waiters)
+                continue
+            token = self._pick(resource)
+            if not token:
+                self._schedule_wakeup(resource)
+                return
+            heapq.heappop(waiters)
+            future.set_result(self._take(token, resource))
+
+        wakeup = self._wakeups.pop(resource, None)
+        if wakeup is not None:
+            wakeup.cancel()
+
+    def _schedule_wakeup(self, resource: str):
+        wakeup = self._wakeups.get(resource)
+        if wakeup is not None:
+            wakeup.cancel()
+        delay = max(0.0, self._next_reset(resource) - time.time()) + 0.5
+        self._wakeups[resource] = asyncio.get_running_loop().call_later(delay, self._drain_resource, resource)
+
+    def stats(self) -> Dict:
+        now = time.time()
+        return {
+            **self._stats,
+            "waiting": sum(len(w) for w in self._waiters.values()),
+            "waiting_by_resource": {r: len(w) for r, w in self._waiters.items() if w},
+            "tokens": [
+                {
+                    resource: {
+                        "remaining": bucket.remaining,
+                        "resets_in_seconds": max(0, int(bucket.reset_at - now)),
+                    }
+                    for resource, bucket in token.buckets.items()
+                }
+                for token in self._tokens
+            ],
+        }
+
+
+scheduler = GitHubScheduler(GITHUB_TOKENS)
+
+
+async def scheduled_request(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    resource: str = "core",
+    **kwargs
+) -> httpx.Response:
+    """Sends a GitHub request through the shared scheduler and token pool."""
+    headers = dict(kwargs.pop("headers", None) or {})
+
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        token = await scheduler.acquire(resource)
+        if token.value:
+            headers["Authorization"] = f"token {token.value}"
+
+        res = await send(client, method, url, headers=headers, **kwargs)
+
+        exhausted = (
+            res.status_code in (403, 429)
+            and (res.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in res.headers)
+        )
+        if not exhausted:
+            scheduler.record(token, res.headers, resource)
+            return res
+
+        scheduler.mark_exhausted(token, res.headers, resource)
+
+    position = scheduler._queue_position(_priority.get(), resource)
+    raise GitHubRateLimited(scheduler.estimate_wait(resource, position), position)
@@ -1,16 +1,17 @@
-import requests
+import asyncio
+import base64
+import httpx
 from datetime import datetime, timedelta, timezone
 from collections import Counter
-from app.config import GITHUB_TOKEN
+from typing import Optional
+from urllib.parse import parse_qs
+from app.config import GITHUB_CONCURRENCY, GITHUB_ANALYSIS_MODE
+from app.services.github_transport import get_github_client, new_github_client
+from app.services.github_cache import conditional_get
+from app.services.readme_analyzer import analyze_readme, scan_readme
+from app.services.repo_cache import get_cached_repos, store_repo_entries
 
-GITHUB_API = "https://api.github.com"
-
-
-def github_headers():
-    return {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json"
-    }
+REPO_LIMIT = 15
 
 
 def extract_github_username(github_url: str) -> str:
@@ -26,9 +27,9 @@ def extract_github_username(github_url: str) -> str:
     return username
 
 
-def fetch_user(username: str):
-    url = f"{GITHUB_API}/users/{username}"
-    res = requests.get(url, headers=github_headers())
+async def fetch_user(username: str, client: Optional[httpx.AsyncClient] = None):
+    client = client or get_github_client()
+    res = await conditional_get(client, f"/users/{username}")
 
     if res.status_code != 200:
         raise Exception(f"GitHub user fetch failed: {res.text}")
@@ -36,9 +37,9 @@ def fetch_user(username: str):
     return res.json()
 
 
-def fetch_repos(username: str, limit=20):
-    url = f"{GITHUB_API}/users/{username}/repos?per_page=100&sort=pushed"
-    res = requests.get(url, headers=github_headers())
+async def fetch_repos(username: str, limit=20, client: Optional[httpx.AsyncClient] = None):
+    client = client or get_github_client()
+    res = await conditional_get(client, f"/users/{username}/repos", {"per_page": 100, "sort": "pushed"})
 
     if res.status_code != 200:
         raise Exception(f"GitHub repos fetch failed: {res.text}")
@@ -47,22 +48,28 @@ def fetch_repos(username: str, limit=20):
     return repos[:limit]
 
 
-def fetch_languages(username: str, repo_name: str):
-    url = f"{GITHUB_API}/repos/{username}/{repo_name}/languages"
-    res = requests.get(url, headers=github_headers())
+async def fetch_languages(username: str, repo_name: str, client: Optional[httpx.AsyncClient] = None):
+    """Language byte counts; {} if the repo has none, None if GitHub failed to answer."""
+    client = client or get_github_client()
+    res = await conditional_get(client, f"/repos/{username}/{repo_name}/languages")
 
-    if res.status_code != 200:
+    if res.status_code == 404:
         return {}
+    if res.status_code != 200:
+        return None
 
     return res.json()
 
 
-def fetch_readme(username: str, repo_name: str):
-    url = f"{GITHUB_API}/repos/{username}/{repo_name}/readme"
-    res = requests.get(url, headers=github_headers())
+async def fetch_readme(username: str, repo_name: str, client: Optional[httpx.AsyncClient] = None):
+    """README text; "" if the repo has none, None if GitHub failed to answer."""
+    client = client or get_github_client()
+    res = await conditional_get(client, f"/repos/{username}/{repo_name}/readme")
 
-    if res.status_code != 200:
+    if res.status_code == 404:
         return ""
+    if res.status_code != 200:
+        return None
 
     data = res.json()
 
@@ -70,180 +77,163 @@ def fetch_readme(username: str, repo_name: str):
     if "content" not in data:
         return ""
 
-    import base64
     try:
         decoded = base64.b64decode(data["content"]).decode("utf-8", errors="ignore")
         return decoded
-    except:
+    except Exception:
         return ""
 
 
-def fetch_commits(username: str, repo_name: str, days=90):
-    since_time = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-
-    url = f"{GITHUB_API}/repos/{username}/{repo_name}/commits?per_page=100&since={since_time}"
-    res = requests.get(url, headers=github_headers())
-
+async def fetch_commit_count(username: str, repo_name: str, days=90, client: Optional[httpx.AsyncClient] = None):
+    """
+    Exact number of commits in the last `days` days without downloading them:
+    with per_page=1 the page number of the `rel="last"` link is the count.
+    """
+    client = client or get_github_client()
+    # Day granularity keeps the URL (and so the ETag cache key) stable within a day
+    since_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+    since_time = datetime.combine(since_date, datetime.min.time(), tzinfo=timezone.utc).isoformat()
+
+    res = await conditional_get(
+        client,
+        f"/repos/{username}/{repo_name}/commits",
+        {"per_page": 1, "since": since_time}
+    )
+
+    # 409 = empty repository; anything else is a failure (None), not "no commits"
+    if res.status_code == 409:
+        return 0
     if res.status_code != 200:
-        return []
-
-    return res.json()
+        return None
 
+    last_page = _last_page_from_link(res.headers.get("Link"))
+    if last_page is not None:
+        return last_page
 
-def detect_project_type(languages: list, readme_text: str, repo_name: str, description: str):
-    text = (readme_text + " " + (description or "") + " " + repo_name).lower()
-    langs = [l.lower() for l in languages]
-
-    if "next.js" in text or "nextjs" in text:
-        return "Web Development Project"
-    if "react" in text:
-        return "Web Development Project"
-    if "firebase" in text:
-        return "Web Development Project"
+    # No pagination: zero or one commit on the only page
+    return len(res.json())
 
-    if "arduino" in text or "esp32" in text or "iot" in text:
-        return "IoT / Embedded Project"
 
-    if "machine learning" in text or "random forest" in text or "tensorflow" in text:
-        return "Machine Learning Project"
+def _last_page_from_link(link_header: Optional[str]) -> Optional[int]:
+    if not link_header:
+        return None
 
-    if "java" in langs and "mysql" in text:
-        return "Java + Database Project"
+    for part in link_header.split(","):
+        if 'rel="last"' not in part:
+            continue
+        query = part.split(";")[0].strip().strip("<>").split("?", 1)[-1]
+        params = parse_qs(query)
+        if "page" in params:
+            return int(params["page"][0])
 
-    if "matlab" in text:
-        return "MATLAB Simulation Project"
+    return None
 
-    if "python" in langs:
-        return "Python Project"
 
-    if "java" in langs:
-        return "Java Project"
+def detect_project_type(languages: list, readme_text: str, repo_name: str, description: str):
+    return analyze_readme(readme_text, languages, repo_name, description)["project_type"]
 
-    if "c++" in langs or "c" in langs:
-        return "C/C++ Project"
 
-    return "General Project"
+def extract_keywords_from_readme(readme_text: str):
+    return scan_readme(readme_text)["keywords"]
 
 
-def extract_keywords_from_readme(readme_text: str):
-    keywords = [
-        "react", "next", "node", "express", "mongodb", "mysql", "firebase",
-        "fastapi", "flask", "django", "api", "rest",
-        "arduino", "esp32", "iot",
-        "machine learning", "tensorflow", "pytorch",
-        "java", "python", "c++", "c", "matlab",
-        "tailwind", "bootstrap"
-    ]
+def extract_deployment_links(readme_text: str):
+    return scan_readme(readme_text)["links"]
+
+
+def build_repo_entry(repo: dict, languages_used: Optional[list], readme_text: Optional[str], commits_90: Optional[int]):
+    """
+    Per-repo analysis entry (one element of `repo_analysis`).
+    A None input means that fetch failed: the entry is built from what is
+    known and marked `incomplete`, so it is neither cached nor carried forward.
+    """
+    repo_name = repo["name"]
+    description = repo.get("description", "")
+    incomplete = languages_used is None or readme_text is None or commits_90 is None
+    languages_used = languages_used or []
+    readme_text = readme_text or ""
+
+    readme_exists = True if readme_text.strip() else False
+
+    # One scan of the README yields keywords, links and the project-type vote
+    readme_signals = analyze_readme(
+        readme_text=readme_text,
+        languages=languages_used,
+        repo_name=repo_name,
+        description=description
+    )
 
-    found = []
-    lower_text = readme_text.lower()
+    return {
+        "repo_name": repo_name,
+        "description": description or "",
+        "pushed_at": repo.get("pushed_at"),
+        "languages_used": languages_used,
+        "project_type": readme_signals["project_type"],
+        "stack_detected": readme_signals["stack_detected"],
+        "deployment_links": readme_signals["deployment_links"],
+        "readme_exists": readme_exists,
+        "commits_last_90_days_estimated": commits_90 or 0,
+        "active_in_last_90_days": is_active_in_last_90_days(repo.get("pushed_at")),
+        "incomplete": incomplete
+    }
 
-    for k in keywords:
-        if k in lower_text:
-            found.append(k)
 
-    return list(set(found))
+def reuse_repo_entry(repo: dict, previous_entry: dict, commits_90: Optional[int]):
+    """
+    Carries a stored entry forward for a repo whose `pushed_at` is unchanged.
+    Only the time-dependent fields are refreshed: the 90-day window rolls even
+    without pushes, so `commits_90` is this run's count (0 for a repo not
+    pushed inside the window, None if the fetch failed).
+    """
+    return {
+        **previous_entry,
+        "description": repo.get("description") or "",
+        "active_in_last_90_days": is_active_in_last_90_days(repo.get("pushed_at")),
+        "commits_last_90_days_estimated": commits_90 or 0,
+        "incomplete": commits_90 is None
+    }
 
 
-def extract_deployment_links(readme_text: str):
-    links = []
-    for word in readme_text.split():
-        if word.startswith("http://") or word.startswith("https://"):
-            cleaned = word.strip("()[]{}<>\"',")
-            links.append(cleaned)
-
-    # keep only meaningful links
-    filtered = []
-    for l in links:
-        if "shields.io" in l:
-            continue
-        if "github-readme-stats" in l:
-            continue
-        if "streak-stats" in l:
-            continue
-        if "profile-trophy" in l:
-            continue
-        filtered.append(l)
+def entry_from_cache(repo: dict, cached: dict, commits_90: Optional[int]):
+    """Builds an entry from the shared repo cache plus this run's commit count."""
+    return {
+        "repo_name": repo["name"],
+        "description": repo.get("description") or "",
+        "pushed_at": repo.get("pushed_at"),
+        **cached,
+        "commits_last_90_days_estimated": commits_90 or 0,
+        "active_in_last_90_days": is_active_in_last_90_days(repo.get("pushed_at")),
+        "incomplete": commits_90 is None
+    }
 
-    return list(set(filtered))[:5]
 
+def is_active_in_last_90_days(pushed_at: Optional[str]) -> bool:
+    if not pushed_at:
+        return False
 
-def analyze_github_profile(github_url: str):
-    username = extract_github_username(github_url)
+    last_90_days = datetime.now(timezone.utc) - timedelta(days=90)
+    pushed_time = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+    return pushed_time > last_90_days
 
-    user_data = fetch_user(username)
-    repos = fetch_repos(username, limit=15)
 
+def build_github_analysis(username: str, user_data: dict, repo_analysis: list):
+    """Aggregates per-repo entries into the stored `github_analysis` dict."""
     overall_languages = Counter()
     project_type_distribution = Counter()
 
-    last_90_days = datetime.now(timezone.utc) - timedelta(days=90)
-
-    repo_analysis = []
-
     commits_last_90_total = 0
     active_repo_count_90 = 0
 
-    # Only fetch commit data for top 5 repos (big optimization)
-    repos_for_commit_check = repos[:5]
-
-    commit_map = {}
-
-    for repo in repos_for_commit_check:
-        repo_name = repo["name"]
-        commits = fetch_commits(username, repo_name, days=90)
-        commit_map[repo_name] = len(commits)
-
-    for repo in repos:
-        repo_name = repo["name"]
-        description = repo.get("description", "")
-
-        # languages
-        languages_dict = fetch_languages(username, repo_name)
-        languages_used = list(languages_dict.keys())
-
-        for lang in languages_used:
+    for entry in repo_analysis:
+        for lang in entry["languages_used"]:
             overall_languages[lang] += 1
 
-        # readme
-        readme_text = fetch_readme(username, repo_name)
-
-        readme_exists = True if readme_text.strip() else False
-        stack_detected = extract_keywords_from_readme(readme_text) if readme_exists else []
-        deployment_links = extract_deployment_links(readme_text) if readme_exists else []
-
-        project_type = detect_project_type(
-            languages=languages_used,
-            readme_text=readme_text,
-            repo_name=repo_name,
-            description=description
-        )
-
-        project_type_distribution[project_type] += 1
-
-        pushed_at = repo.get("pushed_at")
-        active_in_last_90_days = False
+        project_type_distribution[entry["project_type"]] += 1
 
-        if pushed_at:
-            pushed_time = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
-            if pushed_time > last_90_days:
-                active_repo_count_90 += 1
-                active_in_last_90_days = True
+        if entry["active_in_last_90_days"]:
+            active_repo_count_90 += 1
 
-        commits_90 = commit_map.get(repo_name, 0)
-        commits_last_90_total += commits_90
-
-        repo_analysis.append({
-            "repo_name": repo_name,
-            "description": description or "",
-            "languages_used": languages_used,
-            "project_type": project_type,
-            "stack_detected": stack_detected,
-            "deployment_links": deployment_links,
-            "readme_exists": readme_exists,
-            "commits_last_90_days_estimated": commits_90,
-            "active_in_last_90_days": active_in_last_90_days
-        })
+        commits_last_90_total += entry["commits_last_90_days_estimated"]
 
     top_languages = [lang for lang, _ in overall_languages.most_common(6)]
 
@@ -270,3 +260,130 @@ def analyze_github_profile(github_url: str):
         "last_updated": datetime.now(timezone.utc).isoformat(),
         "repo_analysis": repo_analysis
     }
+
+
+async def analyze_github_profile_async(
+    github_url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    concurrency: int = GITHUB_CONCURRENCY,
+    previous: Optional[dict] = None
+):
+    """
+    Async GitHub analysis. Per-repo requests are fanned out concurrently,
+    bounded by `concurrency` in-flight calls, so each stage costs roughly
+    one network round trip instead of one per repo.
+
+    Incremental mode: pass the stored `github_analysis` as `previous` and only
+    repos whose `pushed_at` changed get their languages / README refetched;
+    90-day commit counts are refreshed for every active repo, since the window
+    moves. The aggregates are rebuilt from the merged set.
+    """
+    client = client or get_github_client()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def limited(coro):
+        async with semaphore:
+            return await coro
+
+    username = extract_github_username(github_url)
+
+    # Stage 1: user + repo list
+    user_data, repos = await asyncio.gather(
+        fetch_user(username, client=client),
+        fetch_repos(username, limit=REPO_LIMIT, client=client)
+    )
+
+    previous_entries = {}
+    if previous and previous.get("username", "").lower() == username.lower():
+        previous_entries = {e["repo_name"]: e for e in previous.get("repo_analysis") or []}
+
+    def unchanged(repo):
+        entry = previous_entries.get(repo["name"])
+        # An entry built from a failed fetch is refetched even if the repo didn't change
+        return (
+            entry is not None and not entry.get("incomplete")
+            and entry.get("pushed_at") and entry["pushed_at"] == repo.get("pushed_at")
+        )
+
+    changed_repos = [repo for repo in repos if not unchanged(repo)]
+
+    # Shared repo-level cache: same (owner, repo, pushed_at) already analysed for someone else
+    shared_entries = await get_cached_repos(changed_repos)
+    repos_to_fetch = [repo for repo in changed_repos if repo["name"] not in shared_entries]
+
+    # Exact 90-day commit counts for every repo pushed in the window, unchanged
+    # ones included: old commits age out of the window without any push. A
+    # per_page=1 request each, mostly answered with a free 304. A repo not
+    # pushed in the window cannot have commits in it, so it costs no request
+    repos_for_commit_check = [repo for repo in repos if is_active_in_last_90_days(repo.get("pushed_at"))]
+
+    # Stage 2: commit counts for active repos, languages and readmes for uncached ones, in parallel
+    commit_results, language_results, readme_results = await asyncio.gather(
+        asyncio.gather(*[
+            limited(fetch_commit_count(username, repo["name"], days=90, client=client))
+            for repo in repos_for_commit_check
+        ]),
+        asyncio.gather(*[
+            limited(fetch_languages(username, repo["name"], client=client))
+            for repo in repos_to_fetch
+        ]),
+        asyncio.gather(*[
+            limited(fetch_readme(username, repo["name"], client=client))
+            for repo in repos_to_fetch
+        ])
+    )
+
+    commit_map = {
+        repo["name"]: count
+        for repo, count in zip(repos_for_commit_check, commit_results)
+    }
+
+    built_entries = [
+        build_repo_entry(
+            repo,
+            languages_used=list(languages_dict.keys()) if languages_dict is not None else None,
+            readme_text=readme_text,
+            commits_90=commit_map.get(repo["name"], 0)
+        )
+        for repo, languages_dict, readme_text in zip(repos_to_fetch, language_results, readme_results)
+    ]
+    await store_repo_entries(repos_to_fetch, built_entries)
+
+    fresh_entries = {entry["repo_name"]: entry for entry in built_entries}
+    for repo in changed_repos:
+        if repo["name"] in shared_entries:
+            fresh_entries[repo["name"]] = entry_from_cache(
+                repo, shared_entries[repo["name"]], commit_map.get(repo["name"], 0)
+            )
+
+    # Keep GitHub's pushed-order; unchanged repos reuse their stored entry
+    repo_analysis = [
+        fresh_entries[repo["name"]] if repo["name"] in fresh_entries
+        else reuse_repo_entry(repo, previous_entries[repo["name"]], commit_map.get(repo["name"], 0))
+        for repo in repos
+    ]
+
+    return build_github_analysis(username, user_data, repo_analysis)
+
+
+async def run_github_analysis(github_url: str, previous: Optional[dict] = None):
+    """
+    Runs the analysis backend selected by GITHUB_ANALYSIS_MODE (rest | graphql).
+    `previous` enables incremental refresh on the REST backend; the GraphQL
+    backend is a single request either way.
+    """
+    if GITHUB_ANALYSIS_MODE == "graphql":
+        from app.services.github_graphql_service import analyze_github_profile_graphql
+        return await analyze_github_profile_graphql(github_url)
+
+    return await analyze_github_profile_async(github_url, previous=previous)
+
+
+async def _analyze_with_own_client(github_url: str):
+    async with new_github_client() as client:
+        return await analyze_github_profile_async(github_url, client=client)
+
+
+def analyze_github_profile(github_url: str):
+    """Sync wrapper for scripts / non-async callers."""
+    return asyncio.run(_analyze_with_own_client(github_url))
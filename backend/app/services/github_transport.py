@@ -0,0 +1,182 @@
+"""
+github_transport.py — pooled, resilient HTTP transport for every GitHub call.
+
+  - one process-wide httpx.AsyncClient with keep-alive connection pooling
+    (no TLS handshake per request)
+  - explicit connect/read timeouts so a slow GitHub response can't hang a worker
+  - retries for 5xx, 429 and secondary-rate-limit 403s with jittered
+    exponential backoff (Retry-After is honoured when present)
+  - a circuit breaker that fails fast with `GitHubUnavailable` while GitHub is
+    degraded, then lets a single probe through after the cooldown
+
+Primary rate-limit exhaustion (X-RateLimit-Remaining: 0) is NOT retried here;
+the response is returned so `github_scheduler` can switch tokens or queue.
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+import httpx
+
+from app.config import GITHUB_TOKEN
+
+GITHUB_API = "https://api.github.com"
+
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SECONDS = 30.0
+
+# Shared async client (connection pool reused by every analysis)
+_client: Optional[httpx.AsyncClient] = None
+
+
+class GitHubUnavailable(Exception):
+    """GitHub is failing; the circuit breaker is open."""
+
+
+def github_headers():
+    return {
+        "Authorization": f"token {GITHUB_TOKEN}",
+        "Accept": "application/vnd.github+json"
+    }
+
+
+def new_github_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=GITHUB_API,
+        headers=github_headers(),
+        timeout=TIMEOUT,
+        limits=LIMITS,
+    )
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """Returns the process-wide AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = new_github_client()
+    return _client
+
+
+async def close_github_client():
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def before_request(self) -> bool:
+        """Raises while open; returns True if this request is the half-open probe."""
+        state = self.state
+        if state == "open":
+            raise GitHubUnavailable("GitHub API is degraded; failing fast (circuit open)")
+        if state == "half_open":
+            # Only one probe at a time while half-open
+            if self._probe_in_flight:
+                raise GitHubUnavailable("GitHub API is degraded; recovery probe in progress")
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.failures >= self.threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN_SECONDS)
+
+
+def _is_secondary_rate_limit(res: httpx.Response) -> bool:
+    if res.status_code == 429:
+        return True
+    if res.status_code != 403:
+        return False
+    if res.headers.get("X-RateLimit-Remaining") == "0":
+        return False  # primary limit: handled by the scheduler
+    return "Retry-After" in res.headers or "secondary rate limit" in res.text.lower()
+
+
+def _backoff_delay(attempt: int, res: Optional[httpx.Response]) -> float:
+    if res is not None and res.headers.get("Retry-After", "").isdigit():
+        return min(float(res.headers["Retry-After"]), BACKOFF_MAX_SECONDS * 4)
+    # Full jitter
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+async def send(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    """Sends one logical request with timeouts, retries and the circuit breaker."""
+    probe = breaker.before_request()
+    recorded = False
+
+    try:
+        res: Optional[httpx.Response] = None
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                res = await client.request(method, url, **kwargs)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if attempt == MAX_RETRIES:
+                    breaker.record_failure()
+                    recorded = True
+                    raise GitHubUnavailable(f"GitHub request failed: {e}") from e
+                await asyncio.sleep(_backoff_delay(attempt, None))
+                continue
+
+            retryable = res.status_code >= 500 or _is_secondary_rate_limit(res)
+            if not retryable:
+                breaker.record_success()
+                recorded = True
+                return res
+
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(_backoff_delay(attempt, res))
+
+        # Out of retries: only server errors count against GitHub's health
+        if res.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        recorded = True
+        return res
+    finally:
+        # A probe that ended any other way (cancelled, unexpected error) would
+        # otherwise leave the breaker half-open with no probe ever allowed again
+        if probe and not recorded:
+            breaker.record_failure()
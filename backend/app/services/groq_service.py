@@ -1,16 +1,32 @@
-from groq import AsyncGroq
-from app.config import GROQ_API_KEY, GROQ_MODEL
+from functools import partial
+from typing import AsyncIterator, List, Optional, Tuple
+from app.config import GROQ_MODEL
+from app.services.company_match_prompt import build_company_table
+from app.services.llm_cache import cached_completion, llm_cache_key, lookup_completion, store_completion
+from app.services.llm_gateway import chat_completion, stream_chat_completion
 import json
+import re
 
-client = AsyncGroq(api_key=GROQ_API_KEY)
+
+def _parse_json_response(response_text: str) -> dict:
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        # If response isn't valid JSON, try to extract JSON from markdown
+        if "```json" in response_text:
+            return json.loads(response_text.split("```json")[1].split("```")[0].strip())
+        elif "```" in response_text:
+            return json.loads(response_text.split("```")[1].split("```")[0].strip())
+        raise ValueError("Groq response is not valid JSON")
 
 
-async def analyze_github_with_groq(github_data: dict) -> dict:
+async def analyze_github_with_groq(github_data: dict, refresh: bool = False) -> dict:
     """
     Use Groq AI to analyze GitHub profile data and provide intelligent insights.
     
     Args:
         github_data: The GitHub analysis data from github_service
+        refresh: Bypass the LLM cache and ask Groq again
         
     Returns:
         dict with skill_level, strengths, improvements, quality_score, recommendations
@@ -77,8 +93,10 @@ Based on this data, provide a detailed analysis in JSON format with the followin
 IMPORTANT: Respond ONLY with valid JSON. No markdown, no code blocks, just the JSON object."""
 
     try:
-        # Call Groq API
-        chat_completion = await client.chat.completions.create(
+        # Call Groq API (identical GitHub data is answered from the LLM cache)
+        return await cached_completion(
+            partial(chat_completion, "github_analysis"),
+            _parse_json_response,
             messages=[
                 {
                     "role": "user",
@@ -88,28 +106,8 @@ IMPORTANT: Respond ONLY with valid JSON. No markdown, no code blocks, just the J
             model=GROQ_MODEL,  # configurable model via env `GROQ_MODEL`
             temperature=0.3,  # Lower temperature for more consistent analysis
             max_tokens=2000,
+            refresh=refresh,
         )
-        
-        # Extract response
-        response_text = chat_completion.choices[0].message.content.strip()
-        
-        # Parse JSON response
-        try:
-            analysis = json.loads(response_text)
-            return analysis
-        except json.JSONDecodeError:
-            # If response isn't valid JSON, try to extract JSON from markdown
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-                analysis = json.loads(json_str)
-                return analysis
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-                analysis = json.loads(json_str)
-                return analysis
-            else:
-                raise ValueError("Groq response is not valid JSON")
-                
     except Exception as e:
         err_str = str(e)
         # Detect decommissioned model errors from provider and provide actionable guidance
@@ -155,18 +153,8 @@ IMPORTANT: Respond ONLY with valid JSON. No markdown, no code blocks, just the J
         }
 
 
-async def analyze_company_matches_with_groq(student: dict, company_matches: list) -> dict:
-    """
-    Use Groq AI to analyze student profile against company matches and provide detailed insights.
-    
-    Args:
-        student: Student profile data
-        company_matches: List of company match results from company_match_service
-        
-    Returns:
-        dict with profile analysis, per-company insights, and recommendations
-    """
-    
+def build_company_match_request(student: dict, company_matches: list) -> dict:
+    """Chat completion params (model, messages, ...) for the company-match analysis."""
     # Extract student data
     name = student.get("name", "Student")
     branch = student.get("branch", "Unknown")
@@ -175,6 +163,9 @@ async def analyze_company_matches_with_groq(student: dict, company_matches: list
     skills = student.get("skills", [])
     github_analysis = student.get("github_analysis") or {} # Ensure it's a dict
     prs_score = student.get("prs_score", 0)
+
+    # Top matches + nearest misses as a token-budgeted table, not the whole catalog as JSON
+    table = build_company_table(company_matches)
     
     # Build comprehensive prompt
     prompt = f"""You are an expert career counselor and placement advisor. Analyze this student's profile against their company matches and provide detailed, actionable insights.
@@ -191,8 +182,8 @@ async def analyze_company_matches_with_groq(student: dict, company_matches: list
 - Public Repos: {github_analysis.get('public_repos', 0)}
 - Recent Activity (90d): {(github_analysis.get('activity_summary') or {}).get('commits_last_90_days_estimated', 0)} commits
 
-**Company Matches:**
-{json.dumps(company_matches, indent=2)}
+**Company Matches** (best {table['companies_kept']} of {table['companies_total']}: top eligible matches, then the nearest misses; one row per company, columns in the first line):
+{table['text']}
 
 **Response Structure (Strict JSON):**
 {{
@@ -207,7 +198,7 @@ async def analyze_company_matches_with_groq(student: dict, company_matches: list
   "overall_profile_summary": "2-3 sentences summarizing the student's placement readiness and key differentiators",
   "company_insights": [
     {{
-      "company_name": "Exact company name from matches",
+      "company_name": "Exact company name from the table",
       "is_eligible": true/false,
       "match_reasoning": "List ONLY positive match attributes. Example: 'Student has required 8.0 CGPA and Java skills'. Do NOT mention missing skills here.",
       "eligibility_explanation": "If eligible, explain why. If NOT eligible, list ONLY the MISSING requirements. Example: 'Missing required System Design skill'.",
@@ -228,52 +219,147 @@ async def analyze_company_matches_with_groq(student: dict, company_matches: list
 IMPORTANT: Respond ONLY with valid JSON.
 """
 
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ],
+        "model": GROQ_MODEL,
+        "temperature": 0.4,  # Slightly higher for more creative insights
+        "max_tokens": 3000,  # More tokens for comprehensive analysis
+    }
+
+
+def company_match_error(err_str: str) -> dict:
+    return {
+        "profile_strengths": ["Unable to analyze at this time"],
+        "profile_weaknesses": ["Analysis failed - please try again"],
+        "overall_profile_summary": f"Analysis failed: {err_str}",
+        "company_insights": [],
+        "top_priority_actions": ["Retry the analysis"],
+        "recommended_companies_to_focus": [],
+        "error": err_str
+    }
+
+
+async def analyze_company_matches_with_groq(student: dict, company_matches: list) -> dict:
+    """
+    Use Groq AI to analyze student profile against company matches and provide detailed insights.
+    
+    Args:
+        student: Student profile data
+        company_matches: List of company match results from company_match_service
+        
+    Returns:
+        dict with profile analysis, per-company insights, and recommendations
+    """
+    
     try:
-        # Call Groq API
-        chat_completion = await client.chat.completions.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model=GROQ_MODEL,
-            temperature=0.4,  # Slightly higher for more creative insights
-            max_tokens=3000,  # More tokens for comprehensive analysis
+        # Call Groq API (an unchanged profile + match list is answered from the LLM cache)
+        return await cached_completion(
+            partial(chat_completion, "company_match"),
+            _parse_json_response,
+            **build_company_match_request(student, company_matches)
         )
-        
-        # Extract response
-        response_text = chat_completion.choices[0].message.content.strip()
-        
-        # Parse JSON response
-        try:
-            analysis = json.loads(response_text)
-            return analysis
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-                analysis = json.loads(json_str)
-                return analysis
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-                analysis = json.loads(json_str)
-                return analysis
-            else:
-                raise ValueError("Groq response is not valid JSON")
-                
     except Exception as e:
-        err_str = str(e)
-        # Return error structure
-        return {
-            "profile_strengths": ["Unable to analyze at this time"],
-            "profile_weaknesses": ["Analysis failed - please try again"],
-            "overall_profile_summary": f"Analysis failed: {err_str}",
-            "company_insights": [],
-            "top_priority_actions": ["Retry the analysis"],
-            "recommended_companies_to_focus": [],
-            "error": err_str
-        }
+        return company_match_error(str(e))
+
+
+class _InsightScanner:
+    """
+    Pulls complete objects out of the "company_insights" array of a JSON
+    document that is still being streamed.
+    """
+
+    _ARRAY_START = re.compile(r'"company_insights"\s*:\s*\[')
+
+    def __init__(self):
+        self.text = ""
+        self.pos: Optional[int] = None  # just after the last complete object
+        self._start = 0
+        self.closed = False
+
+    def feed(self, delta: str) -> List[dict]:
+        self.text += delta
+        if self.pos is None:
+            match = self._ARRAY_START.search(self.text)
+            if not match:
+                return []
+            self.pos = match.end()
+
+        found = []
+        while not self.closed:
+            end = self._next_object_end()
+            if end is None:
+                break
+            try:
+                found.append(json.loads(self.text[self._start:end]))
+            except json.JSONDecodeError:
+                pass
+            self.pos = end
+        return found
+
+    def _next_object_end(self) -> Optional[int]:
+        i = self.pos
+        while i < len(self.text) and self.text[i] in " \t\r\n,":
+            i += 1
+        if i >= len(self.text):
+            return None
+        if self.text[i] != "{":
+            # "]" (end of the array) or something unexpected: stop scanning
+            self.closed = True
+            return None
+
+        self._start = i
+        depth, in_string, escaped = 0, False, False
+        for j in range(i, len(self.text)):
+            ch = self.text[j]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+        return None
+
+
+async def stream_company_match_insights(student: dict, company_matches: list) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Company-match analysis as it is generated: yields ("insight", company
+    insight) as soon as each company's object is complete in the token
+    stream, then ("analysis", full analysis). A cached analysis is replayed
+    the same way. Errors propagate.
+    """
+    request = build_company_match_request(student, company_matches)
+    key = llm_cache_key(**request)
+
+    analysis = await lookup_completion(_parse_json_response, key)
+    if analysis is not None:
+        for insight in analysis.get("company_insights", []):
+            yield "insight", insight
+        yield "analysis", analysis
+        return
+
+    scanner = _InsightScanner()
+    async for delta in stream_chat_completion("company_match", **request):
+        for insight in scanner.feed(delta):
+            yield "insight", insight
+
+    response_text = scanner.text.strip()
+    analysis = _parse_json_response(response_text)
+    await store_completion(key, request["model"], response_text)
+    yield "analysis", analysis
 
 
 async def generate_batch_recommendations(batch_stats: list) -> dict:
@@ -315,26 +401,17 @@ async def generate_batch_recommendations(batch_stats: list) -> dict:
     """
 
     try:
-        chat_completion = await client.chat.completions.create(
+        return await cached_completion(
+            partial(chat_completion, "batch_recommendations"),
+            _parse_json_response,
             messages=[{"role": "user", "content": prompt}],
             model=GROQ_MODEL,
             temperature=0.4,
             max_tokens=1500,
         )
-        response_text = chat_completion.choices[0].message.content.strip()
-        
-        try:
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-                return json.loads(json_str)
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-                return json.loads(json_str)
-            else:
-                 return {"error": "Invalid JSON from Groq", "raw": response_text}
-
+    except ValueError as e:
+        print(f"Groq Batch Analysis returned invalid JSON: {e}")
+        return {"error": "Invalid JSON from Groq", "details": str(e)}
     except Exception as e:
         print(f"Groq Batch Analysis Error: {e}")
         return {"error": "Failed to generate recommendations", "details": str(e)}
@@ -0,0 +1,189 @@
+"""
+llm_cache.py — content-addressed cache of Groq chat completions.
+
+Identical inputs (same batch stats, an unchanged student profile, the same
+GitHub analysis) produce the same prompt, so the completion text is stored in
+`llm_response_cache` under a hash of (model, temperature, normalised messages,
+remaining request params) and returned in milliseconds on the next call.
+
+  - normalisation collapses whitespace, so prompt indentation changes don't
+    invalidate the cache; any change in the data does
+  - only responses the caller could parse are stored, a malformed completion
+    is retried next time
+  - streamed completions use lookup_completion / store_completion directly
+    and share entries with the one-shot calls for the same prompt
+  - TTL index on `created_at` (LLM_CACHE_TTL_HOURS) bounds how stale an
+    answer can get
+  - size bound (LLM_CACHE_MAX_MB): least recently used entries are deleted
+    once the stored completions grow past it
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.config import LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_MB
+from app.database import llm_response_cache_collection
+
+_WHITESPACE = re.compile(r"\s+")
+
+_stats: Dict[str, int] = {
+    "hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+    "bytes_served": 0, "bytes_stored": 0,
+}
+
+
+def llm_cache_key(model: str, temperature: float, messages: List[Dict], **params) -> str:
+    material = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "messages": [
+                {"role": m["role"], "content": _WHITESPACE.sub(" ", m["content"]).strip()}
+                for m in messages
+            ],
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_llm_cache_stats() -> Dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+async def get_llm_cache_usage() -> Dict:
+    """Entries and stored bytes currently in the collection."""
+    try:
+        rows = await llm_response_cache_collection.aggregate([
+            {"$group": {"_id": None, "entries": {"$sum": 1}, "bytes": {"$sum": "$size_bytes"}}}
+        ]).to_list(length=1)
+    except Exception as e:
+        print(f"LLM cache usage query failed: {e}")
+        rows = []
+    usage = rows[0] if rows else {"entries": 0, "bytes": 0}
+    return {
+        "entries": usage["entries"],
+        "bytes": usage["bytes"],
+        "max_bytes": int(LLM_CACHE_MAX_MB * 1024 * 1024),
+    }
+
+
+async def ensure_llm_cache_indexes():
+    try:
+        await llm_response_cache_collection.create_index(
+            "created_at",
+            expireAfterSeconds=int(LLM_CACHE_TTL_HOURS * 3600)
+        )
+        await llm_response_cache_collection.create_index("last_accessed")
+    except Exception as e:
+        print(f"LLM cache index creation failed: {e}")
+
+
+async def lookup_completion(parse: Callable[[str], Any], key: str) -> Any:
+    """`parse(cached completion text)`, or None on a miss."""
+    try:
+        doc = await llm_response_cache_collection.find_one_and_update(
+            {"_id": key},
+            {"$set": {"last_accessed": datetime.now(timezone.utc)}, "$inc": {"uses": 1}}
+        )
+    except Exception as e:
+        print(f"LLM cache lookup failed: {e}")
+        doc = None
+
+    result = None
+    if doc:
+        try:
+            result = parse(doc["response"])
+        except Exception:
+            # Stored by an older parser; the caller's fresh completion replaces it
+            result = None
+
+    if result is None:
+        _stats["misses"] += 1
+        return None
+
+    _stats["hits"] += 1
+    _stats["bytes_served"] += doc.get("size_bytes", 0)
+    return result
+
+
+async def cached_completion(
+    create: Callable[..., Awaitable[Any]],
+    parse: Callable[[str], Any],
+    *,
+    model: str,
+    temperature: float,
+    messages: List[Dict],
+    refresh: bool = False,
+    **params
+) -> Any:
+    """
+    `parse(completion text)` from the cache, or from `create(...)` (a chat
+    completions call) on a miss. Errors from `create` or `parse` propagate and
+    nothing is stored. `refresh` skips the lookup and overwrites the entry.
+    """
+    key = llm_cache_key(model, temperature, messages, **params)
+
+    if not refresh:
+        result = await lookup_completion(parse, key)
+        if result is not None:
+            return result
+
+    completion = await create(model=model, temperature=temperature, messages=messages, **params)
+    response_text = completion.choices[0].message.content.strip()
+    result = parse(response_text)
+
+    await store_completion(key, model, response_text)
+    return result
+
+
+async def store_completion(key: str, model: str, response_text: str):
+    now = datetime.now(timezone.utc)
+    size = len(response_text.encode("utf-8"))
+    try:
+        await llm_response_cache_collection.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "model": model,
+                "response": response_text,
+                "size_bytes": size,
+                "uses": 1,
+                "created_at": now,
+                "last_accessed": now,
+            },
+            upsert=True
+        )
+        _stats["stores"] += 1
+        _stats["bytes_stored"] += size
+        # Stores only happen after a multi-second LLM call, so the size check is cheap by comparison
+        await _evict_overflow()
+    except Exception as e:
+        print(f"LLM cache store failed: {e}")
+
+
+async def _evict_overflow():
+    """LRU bound: drop the least recently used entries until the total fits LLM_CACHE_MAX_MB."""
+    usage = await get_llm_cache_usage()
+    overflow = usage["bytes"] - usage["max_bytes"]
+    if overflow <= 0:
+        return
+
+    victims, freed = [], 0
+    cursor = llm_response_cache_collection.find({}, {"_id": 1, "size_bytes": 1}).sort("last_accessed", 1)
+    async for doc in cursor:
+        victims.append(doc["_id"])
+        freed += doc.get("size_bytes", 0)
+        if freed >= overflow:
+            break
+
+    result = await llm_response_cache_collection.delete_many({"_id": {"$in": victims}})
+    _stats["evictions"] += result.deleted_count
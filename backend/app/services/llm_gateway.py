@@ -0,0 +1,231 @@
+"""
+llm_gateway.py — the single way out to Groq for every LLM call.
+
+  - one process-wide AsyncGroq client (pooled keep-alive connections) instead
+    of a client per module or per call
+  - a global concurrency cap (LLM_CONCURRENCY) plus one per endpoint
+    (LLM_ENDPOINT_CONCURRENCY, overridable per endpoint with
+    LLM_ENDPOINT_LIMITS="resume_analysis=2,nlq=4") so a batch job can't take
+    every slot from interactive requests; excess callers queue
+  - 429s are retried after the provider's `retry-after`, and the wait applies
+    to every caller (a shared cooldown) so a burst doesn't keep hitting the
+    limit; 5xx and connection errors are retried with jittered backoff
+  - each logical request has a deadline (LLM_REQUEST_TIMEOUT) covering queueing,
+    retries and the calls themselves; when it can't be met the caller gets
+    `LLMUnavailable` instead of hanging
+  - streamed completions (stream_chat_completion) hold their slots until the
+    last token, so they count against the same limits
+
+The SDK's own retries are disabled so the retry policy lives here only.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import groq
+from groq import AsyncGroq
+
+from app.config import (
+    GROQ_API_KEY, LLM_CONCURRENCY, LLM_ENDPOINT_CONCURRENCY, LLM_ENDPOINT_LIMITS,
+    LLM_REQUEST_TIMEOUT, LLM_MAX_RETRIES
+)
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+_client: Optional[AsyncGroq] = None
+_global_slots: Optional[asyncio.Semaphore] = None
+_endpoint_slots: Dict[str, asyncio.Semaphore] = {}
+# Monotonic time before which no request is sent (set by 429 retry-after)
+_cooldown_until = 0.0
+
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+class LLMUnavailable(Exception):
+    """The request could not be completed within its deadline."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        self.retry_after = int(retry_after) + 1 if retry_after else None
+        super().__init__(message)
+
+
+def get_llm_client() -> AsyncGroq:
+    """Returns the process-wide AsyncGroq client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncGroq(api_key=GROQ_API_KEY, max_retries=0, timeout=LLM_REQUEST_TIMEOUT)
+    return _client
+
+
+async def close_llm_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+    _client = None
+
+
+def _slots(endpoint: str):
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(LLM_CONCURRENCY)
+    if endpoint not in _endpoint_slots:
+        _endpoint_slots[endpoint] = asyncio.Semaphore(
+            LLM_ENDPOINT_LIMITS.get(endpoint, LLM_ENDPOINT_CONCURRENCY)
+        )
+        _stats[endpoint] = {
+            "requests": 0, "waiting": 0, "in_flight": 0, "rate_limited": 0,
+            "retries": 0, "failures": 0, "deadline_exceeded": 0,
+        }
+    return _global_slots, _endpoint_slots[endpoint]
+
+
+def get_llm_gateway_stats() -> Dict:
+    return {
+        "global_limit": LLM_CONCURRENCY,
+        "global_in_flight": sum(s["in_flight"] for s in _stats.values()),
+        "cooldown_seconds": max(0.0, round(_cooldown_until - time.monotonic(), 1)),
+        "endpoints": _stats,
+    }
+
+
+def _retry_after(e: groq.APIStatusError) -> Optional[float]:
+    headers = e.response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    # Full jitter
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+async def _acquire(semaphore: asyncio.Semaphore, deadline: float):
+    """Acquires `semaphore` before `deadline`; a slot won during cancellation is given back."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise asyncio.TimeoutError
+
+    acquired = False
+    try:
+        async with asyncio.timeout(remaining):
+            acquired = await semaphore.acquire()
+    except BaseException:
+        if acquired:
+            semaphore.release()
+        raise
+
+
+@asynccontextmanager
+async def _slot(endpoint: str, deadline: float) -> AsyncIterator[Dict[str, int]]:
+    """Holds an endpoint slot and a global slot; yields the endpoint's stats."""
+    global_slots, endpoint_slots = _slots(endpoint)
+    stats = _stats[endpoint]
+    stats["requests"] += 1
+
+    # Endpoint slot first, so a flooded endpoint waits without holding global slots
+    stats["waiting"] += 1
+    try:
+        await _acquire(endpoint_slots, deadline)
+        try:
+            await _acquire(global_slots, deadline)
+        except BaseException:
+            endpoint_slots.release()
+            raise
+    except asyncio.TimeoutError:
+        stats["deadline_exceeded"] += 1
+        raise LLMUnavailable(f"LLM busy: no {endpoint} slot within the deadline")
+    finally:
+        stats["waiting"] -= 1
+
+    stats["in_flight"] += 1
+    try:
+        yield stats
+    finally:
+        stats["in_flight"] -= 1
+        global_slots.release()
+        endpoint_slots.release()
+
+
+async def _create(endpoint: str, stats: Dict[str, int], deadline: float, params: Dict) -> Any:
+    """The create call with rate-limit cooldown, retries and the deadline."""
+    global _cooldown_until
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        wait = _cooldown_until - time.monotonic()
+        if wait > 0:
+            if time.monotonic() + wait >= deadline:
+                stats["deadline_exceeded"] += 1
+                raise LLMUnavailable("LLM rate limited", retry_after=wait)
+            await asyncio.sleep(wait)
+
+        remaining = deadline - time.monotonic()
+        try:
+            return await asyncio.wait_for(get_llm_client().chat.completions.create(**params), remaining)
+        except asyncio.TimeoutError:
+            stats["deadline_exceeded"] += 1
+            raise LLMUnavailable(f"LLM request for {endpoint} exceeded its deadline")
+        except groq.RateLimitError as e:
+            stats["rate_limited"] += 1
+            delay = _retry_after(e) or _backoff_delay(attempt)
+            _cooldown_until = max(_cooldown_until, time.monotonic() + delay)
+            if attempt == LLM_MAX_RETRIES:
+                stats["failures"] += 1
+                raise LLMUnavailable("LLM rate limited", retry_after=delay) from e
+        except (groq.InternalServerError, groq.APIConnectionError):
+            if attempt == LLM_MAX_RETRIES:
+                stats["failures"] += 1
+                raise
+            delay = _backoff_delay(attempt)
+            if time.monotonic() + delay >= deadline:
+                stats["failures"] += 1
+                raise
+            await asyncio.sleep(delay)
+        stats["retries"] += 1
+
+
+async def chat_completion(endpoint: str, *, timeout: Optional[float] = None, **params) -> Any:
+    """
+    `client.chat.completions.create(**params)` through the gateway. `endpoint`
+    names the call site for its concurrency limit and stats; `timeout` (default
+    LLM_REQUEST_TIMEOUT) is the deadline for the whole request.
+    """
+    deadline = time.monotonic() + (timeout or LLM_REQUEST_TIMEOUT)
+    async with _slot(endpoint, deadline) as stats:
+        return await _create(endpoint, stats, deadline, params)
+
+
+async def stream_chat_completion(endpoint: str, *, timeout: Optional[float] = None, **params) -> AsyncIterator[str]:
+    """
+    Streamed variant of chat_completion: yields content deltas as they arrive.
+    The slots are held until the stream ends; only the initial call is retried
+    (once tokens have been yielded the request can't be replayed).
+    """
+    deadline = time.monotonic() + (timeout or LLM_REQUEST_TIMEOUT)
+    async with _slot(endpoint, deadline) as stats:
+        stream = await _create(endpoint, stats, deadline, {**params, "stream": True})
+        try:
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), deadline - time.monotonic())
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    stats["deadline_exceeded"] += 1
+                    raise LLMUnavailable(f"LLM stream for {endpoint} exceeded its deadline")
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        finally:
+            # Client went away or the deadline hit: release the connection now
+            await stream.close()
@@ -20,14 +20,9 @@ import json
 import time
 from typing import Any, Dict, List, Optional, Tuple
 
-from groq import AsyncGroq
-from app.config import GROQ_API_KEY, GROQ_MODEL
+from app.config import GROQ_MODEL
 from app.database import students_collection
-
-# ---------------------------------------------------------------------------
-# Groq client
-# ---------------------------------------------------------------------------
-_groq_client = AsyncGroq(api_key=GROQ_API_KEY)
+from app.services.llm_gateway import chat_completion, LLMUnavailable
 
 # ---------------------------------------------------------------------------
 # In-memory cache: { query_text_lower: (timestamp, parsed_result) }
@@ -182,7 +177,8 @@ Examples:
 # ---------------------------------------------------------------------------
 async def _parse_query_with_groq(query_text: str) -> Dict:
     """Call Groq to convert natural language query to structured JSON."""
-    chat_completion = await _groq_client.chat.completions.create(
+    completion = await chat_completion(
+        "nlq",
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": query_text},
@@ -192,7 +188,7 @@ async def _parse_query_with_groq(query_text: str) -> Dict:
         max_tokens=500,
     )
 
-    response_text = chat_completion.choices[0].message.content.strip()
+    response_text = completion.choices[0].message.content.strip()
 
     # Try direct JSON parse
     try:
@@ -403,6 +399,8 @@ async def run_nlq_query(query_text: str, limit: int = 50) -> Dict:
         # 2. Groq parse
         try:
             parsed = await _parse_query_with_groq(query_text)
+        except LLMUnavailable:
+            raise
         except Exception as e:
             raise ValueError(f"Groq parsing failed: {str(e)}")
 
@@ -0,0 +1,231 @@
+"""
+pdf_extraction.py — single-parse resume extraction on one PyMuPDF handle.
+
+The legacy pipeline parsed every upload three times (pdfminer for text,
+PyMuPDF for images, tabula + a Java subprocess for tables). Here the document
+is opened once and each page is walked once:
+
+  - text      : page.get_text("dict") blocks, joined in reading order
+  - images    : page.get_images() -> doc.extract_image(), raw bytes stored
+                once per content digest (see resume_images)
+  - tables    : candidates rebuilt from text geometry (rows of aligned cells),
+                returned in tabula's `to_dict(orient="records")` shape
+
+`extract_resume_pdf` returns the same keys `process_resume_upload` returns
+(minus `contact_info`, which is parsed from the text afterwards).
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from app.services.resume_images import image_digest, store_image_bytes
+
+# Spans on the same line closer than this (x font size) belong to one cell
+CELL_GAP_FACTOR = 1.2
+# Rows whose vertical centres differ by less than this (points) are one row
+ROW_TOLERANCE = 2.5
+# Column starts must line up within this many points across rows
+COLUMN_TOLERANCE = 8.0
+MIN_TABLE_ROWS = 2
+MIN_TABLE_COLS = 3
+
+
+def _page_lines(page_dict: Dict) -> List[Dict]:
+    """Flattens text blocks into lines: {"text", "bbox", "spans"}."""
+    lines = []
+    for block in page_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        for line in block.get("lines", []):
+            spans = [s for s in line.get("spans", []) if s.get("text", "").strip()]
+            if not spans:
+                continue
+            lines.append({
+                "text": "".join(s["text"] for s in line["spans"]).strip(),
+                "bbox": line["bbox"],
+                "spans": spans,
+            })
+    return lines
+
+
+def _page_text(page_dict: Dict) -> str:
+    blocks = []
+    for block in page_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        block_lines = [
+            "".join(span["text"] for span in line.get("spans", []))
+            for line in block.get("lines", [])
+        ]
+        blocks.append("\n".join(block_lines))
+    return "\n\n".join(blocks)
+
+
+def _rows_of_cells(lines: List[Dict]) -> List[List[Dict]]:
+    """Groups spans into visual rows, and each row into cells {"x0", "text"}."""
+    spans = []
+    for line in lines:
+        spans.extend(line["spans"])
+
+    spans.sort(key=lambda s: ((s["bbox"][1] + s["bbox"][3]) / 2, s["bbox"][0]))
+
+    rows: List[List[Dict]] = []
+    current: List[Dict] = []
+    current_y = None
+
+    for span in spans:
+        y = (span["bbox"][1] + span["bbox"][3]) / 2
+        if current_y is not None and abs(y - current_y) > ROW_TOLERANCE:
+            rows.append(current)
+            current = []
+        current.append(span)
+        current_y = y
+    if current:
+        rows.append(current)
+
+    result = []
+    for row in rows:
+        row.sort(key=lambda s: s["bbox"][0])
+        cells: List[Dict] = []
+        for span in row:
+            gap_limit = CELL_GAP_FACTOR * span.get("size", 10)
+            if cells and span["bbox"][0] - cells[-1]["x1"] < gap_limit:
+                cells[-1]["text"] += " " + span["text"].strip()
+                cells[-1]["x1"] = span["bbox"][2]
+            else:
+                cells.append({"x0": span["bbox"][0], "x1": span["bbox"][2], "text": span["text"].strip()})
+        result.append(cells)
+    return result
+
+
+def _aligned(row: List[Dict], reference: List[Dict]) -> bool:
+    if len(row) != len(reference):
+        return False
+    return all(abs(a["x0"] - b["x0"]) <= COLUMN_TOLERANCE for a, b in zip(row, reference))
+
+
+def _to_records(rows: List[List[Dict]]) -> List[Dict[str, Any]]:
+    header = []
+    for i, cell in enumerate(rows[0]):
+        name = cell["text"] or f"col_{i}"
+        header.append(name if name not in header else f"{name}_{i}")
+    return [
+        {header[i]: (cell["text"] or None) for i, cell in enumerate(row)}
+        for row in rows[1:]
+    ]
+
+
+def detect_tables(lines: List[Dict]) -> List[List[Dict[str, Any]]]:
+    """
+    Table candidates from text geometry: runs of consecutive rows with the
+    same number of cells whose column starts line up.
+    """
+    tables = []
+    run: List[List[Dict]] = []
+
+    def flush():
+        if len(run) >= MIN_TABLE_ROWS and len(run[0]) >= MIN_TABLE_COLS:
+            tables.append(_to_records(run))
+
+    for row in _rows_of_cells(lines):
+        if run and _aligned(row, run[0]):
+            run.append(row)
+            continue
+        flush()
+        run = [row] if len(row) >= MIN_TABLE_COLS else []
+    flush()
+
+    return tables
+
+
+def _collect_page_images(doc: fitz.Document, page_index: int, image_dir: str, refs: Dict[int, Dict], save: bool):
+    """
+    Records the page's images in `refs` (keyed by xref, so an image repeated
+    on several pages is handled once). Every image gets its content digest, so
+    counts are the same with or without `save`; with `save`, the raw bytes are
+    also written to the content-addressed store as-is.
+    """
+    for img in doc.get_page_images(page_index):
+        xref = img[0]
+        if xref in refs:
+            refs[xref]["pages"].append(page_index + 1)
+            continue
+
+        base_image = doc.extract_image(xref)
+        ref = {"pages": [page_index + 1]}
+        if save:
+            ref.update({
+                "digest": store_image_bytes(base_image["image"], base_image["ext"], image_dir),
+                "ext": base_image["ext"],
+                "width": base_image.get("width"),
+                "height": base_image.get("height"),
+            })
+        else:
+            ref["digest"] = image_digest(base_image["image"])
+        refs[xref] = ref
+
+
+def _unique_images(refs: Dict[int, Dict]) -> List[Dict]:
+    """Merges refs whose bytes are identical (same digest, different xref)."""
+    by_digest: Dict[str, Dict] = {}
+    for ref in refs.values():
+        existing = by_digest.get(ref["digest"])
+        if existing:
+            existing["pages"] = sorted(set(existing["pages"] + ref["pages"]))
+        else:
+            by_digest[ref["digest"]] = ref
+    return list(by_digest.values())
+
+
+def extract_resume_pdf(
+    file_path: str,
+    image_dir: str,
+    deadline: Optional[float] = None,
+    with_tables: bool = True,
+    save_images: bool = True,
+) -> Dict[str, Any]:
+    """
+    Opens the PDF once and returns {"raw_text", "images_extracted", "images", "tables", "pages"}.
+    `pages` holds the per-page text lines (with span font info) for later
+    layout-aware stages.
+    `deadline` (time.monotonic() value) is checked between pages; TimeoutError
+    is raised once it has passed. `with_tables=False` skips the layout table
+    detector (another table backend is in use).
+    Images go to the content-addressed store at `image_dir`; with
+    `save_images=False` they are only counted and `images` is None.
+    """
+    texts = []
+    tables = []
+    pages = []
+    image_refs: Dict[int, Dict] = {}
+
+    with fitz.open(file_path) as doc:
+        for page_index, page in enumerate(doc):
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"extraction stopped at page {page_index + 1}")
+
+            page_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+            lines = _page_lines(page_dict)
+
+            texts.append(_page_text(page_dict))
+            if with_tables:
+                tables.extend(detect_tables(lines))
+            pages.append(lines)
+
+            try:
+                _collect_page_images(doc, page_index, image_dir, image_refs, save_images)
+            except Exception as e:
+                print(f"Error extracting images on page {page_index + 1}: {e}")
+
+    # Distinct images by content in both modes
+    images = _unique_images(image_refs)
+
+    return {
+        "raw_text": "\n\n".join(texts),
+        "images_extracted": len(images),
+        "images": images if save_images else None,
+        "tables": tables,
+        "pages": pages,
+    }
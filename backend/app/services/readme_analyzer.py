@@ -0,0 +1,178 @@
+"""
+readme_analyzer.py — single-scan README analysis for the GitHub analysis.
+
+Each README is normalised once (a precompiled byte translation table lowercases
+ASCII and turns every character outside [a-z0-9+#] into a space) and split
+into a token set. Stack keywords and project-type signals are then hash
+lookups against a precompiled term table, and links come from one
+literal-prefixed URL regex. This replaces ~40 substring scans per README.
+
+Matching is on whole tokens, so "c" no longer matches every README, "java" no
+longer matches "javascript" and "iot" no longer matches "patriot".
+
+(A single combined alternation regex with word boundaries was measured first,
+but CPython's regex engine made it several times slower than the old
+substring checks; see scripts/bench_readme_analyzer.py.)
+"""
+
+import re
+import string
+from typing import Dict, List, Optional, Tuple
+
+# token -> (keyword reported in stack_detected, project-type signal)
+TERM_TABLE: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    "react": ("react", "react"),
+    "reactjs": ("react", "react"),
+    "next": ("next", None),
+    "nextjs": ("next", "nextjs"),
+    "node": ("node", None),
+    "nodejs": ("node", None),
+    "express": ("express", None),
+    "expressjs": ("express", None),
+    "mongodb": ("mongodb", None),
+    "mysql": ("mysql", "mysql"),
+    "firebase": ("firebase", "firebase"),
+    "fastapi": ("fastapi", None),
+    "flask": ("flask", None),
+    "django": ("django", None),
+    "api": ("api", None),
+    "apis": ("api", None),
+    "rest": ("rest", None),
+    "restful": ("rest", None),
+    "arduino": ("arduino", "iot"),
+    "esp32": ("esp32", "iot"),
+    "iot": ("iot", "iot"),
+    "tensorflow": ("tensorflow", "ml"),
+    "pytorch": ("pytorch", None),
+    "java": ("java", None),
+    "python": ("python", None),
+    "c++": ("c++", None),
+    "c": ("c", None),
+    "matlab": ("matlab", "matlab"),
+    "tailwind": ("tailwind", None),
+    "tailwindcss": ("tailwind", None),
+    "bootstrap": ("bootstrap", None),
+}
+
+# Two-token terms: (first, second, phrase in normalised text, keyword, signal)
+PHRASE_TABLE: List[Tuple[bytes, bytes, bytes, Optional[str], Optional[str]]] = [
+    (b"machine", b"learning", b"machine learning", "machine learning", "ml"),
+    (b"random", b"forest", b"random forest", None, "ml"),
+    (b"next", b"js", b"next js", "next", "nextjs"),
+]
+
+_TERM_BYTES = {token.encode(): info for token, info in TERM_TABLE.items()}
+
+# Keyword order used for stable output
+KEYWORDS = list(dict.fromkeys(
+    [kw for kw, _ in TERM_TABLE.values() if kw] + [p[3] for p in PHRASE_TABLE if p[3]]
+))
+
+# Badge / profile-widget hosts that are not project links
+IGNORED_LINK_MARKERS = ("shields.io", "github-readme-stats", "streak-stats", "profile-trophy")
+
+MAX_DEPLOYMENT_LINKS = 5
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'`()\[\]{}]+")
+
+_TOKEN_CHARS = set((string.ascii_lowercase + string.digits + "+#").encode())
+NORMALIZE_TABLE = bytes.maketrans(
+    bytes(range(256)),
+    bytes(
+        c + 32 if 65 <= c <= 90 else (c if c in _TOKEN_CHARS else 32)
+        for c in range(256)
+    ),
+)
+
+
+def _normalize(text: str) -> bytes:
+    return text.encode("utf-8", "ignore").translate(NORMALIZE_TABLE)
+
+
+def _match_terms(normalized: bytes) -> Tuple[set, set]:
+    tokens = set(normalized.split())
+    keywords, signals = set(), set()
+
+    for token in tokens & _TERM_BYTES.keys():
+        keyword, signal = _TERM_BYTES[token]
+        keywords.add(keyword)
+        if signal:
+            signals.add(signal)
+
+    for first, second, phrase, keyword, signal in PHRASE_TABLE:
+        if first in tokens and second in tokens and phrase in normalized:
+            if keyword:
+                keywords.add(keyword)
+            if signal:
+                signals.add(signal)
+
+    return keywords, signals
+
+
+def scan_readme(readme_text: str) -> Dict:
+    """
+    Single scan over the README.
+    Returns {"keywords": [...], "signals": set(...), "links": [...]}.
+    """
+    keywords, signals = _match_terms(_normalize(readme_text))
+
+    links = []
+    for link in URL_PATTERN.findall(readme_text):
+        link = link.rstrip(".,;:!?*_")
+        if link not in links and not any(marker in link for marker in IGNORED_LINK_MARKERS):
+            links.append(link)
+            if len(links) == MAX_DEPLOYMENT_LINKS:
+                break
+
+    return {
+        "keywords": [kw for kw in KEYWORDS if kw in keywords],
+        "signals": signals,
+        "links": links,
+    }
+
+
+def vote_project_type(languages: list, signals: set) -> str:
+    """Same rule precedence as the original substring-based classifier."""
+    langs = {l.lower() for l in languages}
+
+    if signals & {"nextjs", "react", "firebase"}:
+        return "Web Development Project"
+
+    if "iot" in signals:
+        return "IoT / Embedded Project"
+
+    if "ml" in signals:
+        return "Machine Learning Project"
+
+    if "java" in langs and "mysql" in signals:
+        return "Java + Database Project"
+
+    if "matlab" in signals:
+        return "MATLAB Simulation Project"
+
+    if "python" in langs:
+        return "Python Project"
+
+    if "java" in langs:
+        return "Java Project"
+
+    if "c++" in langs or "c" in langs:
+        return "C/C++ Project"
+
+    return "General Project"
+
+
+def analyze_readme(readme_text: str, languages: list, repo_name: str, description: str) -> Dict:
+    """
+    Everything the per-repo entry needs from the README in one scan:
+    {"stack_detected", "deployment_links", "project_type"}.
+    """
+    scan = scan_readme(readme_text)
+    # Repo name / description also vote on the project type
+    _, extra_signals = _match_terms(_normalize(f"{description or ''} {repo_name}"))
+
+    return {
+        "stack_detected": scan["keywords"],
+        "deployment_links": scan["links"],
+        "project_type": vote_project_type(languages, scan["signals"] | extra_signals),
+    }
@@ -0,0 +1,124 @@
+"""
+repo_cache.py — shared per-repository analysis cache.
+
+The README / language derived part of a repo entry only changes when the repo
+is pushed. Entries are keyed by (owner, repo, pushed_at) in
+`repo_analysis_cache` and reused by any analysis that sees the same repo state.
+
+Hits come mostly from re-analysing the same profile (a new GitHub URL on the
+same account, a reset of the stored analysis, several students linking one
+account). `/users/{u}/repos` only lists repos the user owns, so a team project
+is seen under its owner only, and a fork is a repo of its own (the listing
+carries no `parent`, and after the first push its README / languages can
+differ anyway); forks and shared team repos rarely hit across students.
+Entries built from a failed languages / README fetch are never stored.
+
+Eviction:
+  - TTL index on `last_accessed` (REPO_CACHE_TTL_DAYS)
+  - size bound (REPO_CACHE_MAX_ENTRIES): least recently accessed entries are
+    deleted once the collection grows past it
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from app.config import REPO_CACHE_TTL_DAYS, REPO_CACHE_MAX_ENTRIES
+from app.database import repo_analysis_cache_collection
+
+# Fields of a repo_analysis entry that only depend on the repo state
+CACHED_FIELDS = ("languages_used", "project_type", "stack_detected", "deployment_links", "readme_exists")
+
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def repo_cache_key(repo: dict) -> str:
+    owner = ((repo.get("owner") or {}).get("login") or "").lower()
+    return f"{owner}/{repo['name'].lower()}@{repo.get('pushed_at')}"
+
+
+def get_repo_cache_stats() -> Dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+async def ensure_repo_cache_indexes():
+    try:
+        await repo_analysis_cache_collection.create_index(
+            "last_accessed",
+            expireAfterSeconds=int(REPO_CACHE_TTL_DAYS * 86400)
+        )
+    except Exception as e:
+        print(f"Repo cache index creation failed: {e}")
+
+
+async def get_cached_repos(repos: List[dict]) -> Dict[str, Dict]:
+    """Returns {repo_name: cached fields} for repos whose current state is cached."""
+    keyed = {repo_cache_key(repo): repo["name"] for repo in repos if repo.get("pushed_at")}
+    if not keyed:
+        _stats["misses"] += len(repos)
+        return {}
+
+    try:
+        docs = await repo_analysis_cache_collection.find({"_id": {"$in": list(keyed)}}).to_list(length=len(keyed))
+        if docs:
+            await repo_analysis_cache_collection.update_many(
+                {"_id": {"$in": [d["_id"] for d in docs]}},
+                {"$set": {"last_accessed": datetime.now(timezone.utc)}}
+            )
+    except Exception as e:
+        print(f"Repo cache lookup failed: {e}")
+        docs = []
+
+    found = {keyed[d["_id"]]: {f: d.get(f) for f in CACHED_FIELDS} for d in docs}
+    _stats["hits"] += len(found)
+    _stats["misses"] += len(repos) - len(found)
+    return found
+
+
+async def store_repo_entries(repos: List[dict], entries: List[dict]):
+    """Stores the repo-state-dependent fields of freshly built entries."""
+    now = datetime.now(timezone.utc)
+    stored = 0
+
+    try:
+        for repo, entry in zip(repos, entries):
+            # A failed languages/readme fetch must not be served to everyone for 30 days
+            if not repo.get("pushed_at") or entry.get("incomplete"):
+                continue
+            key = repo_cache_key(repo)
+            await repo_analysis_cache_collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "owner": ((repo.get("owner") or {}).get("login") or "").lower(),
+                    "repo": repo["name"],
+                    "pushed_at": repo["pushed_at"],
+                    **{f: entry[f] for f in CACHED_FIELDS},
+                    "created_at": now,
+                    "last_accessed": now,
+                },
+                upsert=True
+            )
+            stored += 1
+
+        _stats["stores"] += stored
+        if stored:
+            await _evict_overflow()
+    except Exception as e:
+        print(f"Repo cache store failed: {e}")
+
+
+async def _evict_overflow():
+    """LRU bound: drop the least recently accessed entries beyond the cap."""
+    total = await repo_analysis_cache_collection.estimated_document_count()
+    overflow = total - REPO_CACHE_MAX_ENTRIES
+    if overflow <= 0:
+        return
+
+    oldest = await repo_analysis_cache_collection.find({}, {"_id": 1}) \
+        .sort("last_accessed", 1).limit(overflow).to_list(length=overflow)
+    result = await repo_analysis_cache_collection.delete_many({"_id": {"$in": [d["_id"] for d in oldest]}})
+    _stats["evictions"] += result.deleted_count
@@ -0,0 +1,83 @@
+"""
+resume_cache.py — content-addressed resume extraction cache.
+
+Uploads are keyed by the SHA-256 of the PDF bytes. Template resumes repeat
+across students, and students re-upload the same file, so the extraction
+result (text, tables, image refs, contact info, sections) is stored once per hash in
+`resume_extraction_cache` and reused by any later upload of the same bytes.
+
+Entries expire RESUME_CACHE_TTL_DAYS after they were last used (TTL index).
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import RESUME_CACHE_TTL_DAYS
+from app.database import resume_extraction_cache_collection
+
+CACHED_FIELDS = (
+    "raw_text", "tables", "images_extracted", "images", "contact_info",
+    "sections_found", "missing_sections", "section_outline",
+)
+
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def get_resume_cache_stats() -> Dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+async def ensure_resume_cache_indexes():
+    try:
+        await resume_extraction_cache_collection.create_index(
+            "last_accessed",
+            expireAfterSeconds=int(RESUME_CACHE_TTL_DAYS * 86400)
+        )
+    except Exception as e:
+        print(f"Resume cache index creation failed: {e}")
+
+
+async def get_cached_extraction(content_hash: str) -> Optional[Dict[str, Any]]:
+    try:
+        doc = await resume_extraction_cache_collection.find_one_and_update(
+            {"_id": content_hash},
+            {"$set": {"last_accessed": datetime.now(timezone.utc)}, "$inc": {"uses": 1}}
+        )
+    except Exception as e:
+        print(f"Resume cache lookup failed: {e}")
+        doc = None
+
+    if not doc:
+        _stats["misses"] += 1
+        return None
+
+    _stats["hits"] += 1
+    cached = {f: doc.get(f) for f in CACHED_FIELDS}
+    if cached["sections_found"] is None:
+        # Entry written before local section detection existed
+        from app.services.resume_sections import detect_sections
+        cached.update(detect_sections(cached["raw_text"] or ""))
+    return cached
+
+
+async def store_extraction(content_hash: str, extraction: Dict[str, Any]):
+    now = datetime.now(timezone.utc)
+    try:
+        await resume_extraction_cache_collection.replace_one(
+            {"_id": content_hash},
+            {
+                "_id": content_hash,
+                **{f: extraction.get(f) for f in CACHED_FIELDS},
+                "uses": 1,
+                "created_at": now,
+                "last_accessed": now,
+            },
+            upsert=True
+        )
+        _stats["stores"] += 1
+    except Exception as e:
+        print(f"Resume cache store failed: {e}")
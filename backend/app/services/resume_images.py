@@ -0,0 +1,65 @@
+"""
+resume_images.py — content-addressed storage for images embedded in resumes.
+
+Images are written exactly as `extract_image` returns them (no decode /
+re-encode) under uploads/resume_images/<aa>/<sha256>.<ext>. The same logo on
+every page, or in every copy of a template resume, is stored once.
+
+Thumbnails are only rendered when requested and cached next to the store.
+"""
+
+import hashlib
+import os
+
+IMAGE_STORE_DIR = "uploads/resume_images/"
+THUMBNAIL_DIR = os.path.join(IMAGE_STORE_DIR, "thumbs")
+
+MIN_THUMBNAIL_SIZE = 32
+MAX_THUMBNAIL_SIZE = 1024
+
+
+def image_path(digest: str, ext: str, store_dir: str = IMAGE_STORE_DIR) -> str:
+    return os.path.join(store_dir, digest[:2], f"{digest}.{ext}")
+
+
+def image_digest(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def store_image_bytes(image_bytes: bytes, ext: str, store_dir: str = IMAGE_STORE_DIR) -> str:
+    """Writes the raw bytes once per digest and returns the digest."""
+    digest = image_digest(image_bytes)
+    path = image_path(digest, ext, store_dir)
+    if os.path.exists(path):
+        return digest
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(image_bytes)
+    os.replace(tmp_path, path)
+    return digest
+
+
+def get_thumbnail(digest: str, ext: str, size: int) -> str:
+    """Path of a PNG thumbnail (longest side `size`), rendered on first request."""
+    from PIL import Image
+
+    size = max(MIN_THUMBNAIL_SIZE, min(MAX_THUMBNAIL_SIZE, size))
+    thumb_path = os.path.join(THUMBNAIL_DIR, f"{digest}_{size}.png")
+    if os.path.exists(thumb_path):
+        return thumb_path
+
+    source = image_path(digest, ext)
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    with Image.open(source) as image:
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        tmp_path = f"{thumb_path}.{os.getpid()}.part"
+        image.save(tmp_path, format="PNG")
+    os.replace(tmp_path, thumb_path)
+    return thumb_path
@@ -0,0 +1,201 @@
+"""
+resume_pipeline.py — one-shot resume pipeline with streamed progress.
+
+Replaces the upload-resume -> analyze-resume -> calculate-prs round trips.
+The route saves the PDF and starts a job; the job runs the stages in order
+
+    extract  -> sections -> analysis (Groq) -> prs
+
+and records an event as each stage starts and finishes. Clients follow the
+job over Server-Sent Events and can render raw text and sections while the
+LLM stage is still running.
+
+Jobs live in this process only and are dropped JOB_RETENTION_SECONDS after
+they finish.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.database import students_collection
+from app.services.resume_service import (
+    process_resume_upload, analyze_resume_with_groq, resume_analysis_key,
+    build_resume_document, resume_upload_summary, analysis_update_fields,
+    stored_resume_analysis, can_reuse_analysis, reupload_update_fields,
+    section_backfill_fields, prs_update_fields
+)
+
+STAGES = ("extract", "sections", "analysis", "prs")
+JOB_RETENTION_SECONDS = 600
+KEEPALIVE_SECONDS = 15
+
+_jobs: Dict[str, "PipelineJob"] = {}
+
+
+class PipelineJob:
+    def __init__(self, email: str):
+        self.id = uuid.uuid4().hex
+        self.email = email
+        self.status = "queued"
+        self.created_at = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self.results: Dict[str, Any] = {}
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    async def emit(self, event: str, data: Dict[str, Any], status: Optional[str] = None):
+        # Status and event change together so followers never see a finished
+        # job without its final event
+        async with self._changed:
+            self.events.append({"id": len(self.events), "event": event, "data": data})
+            if status:
+                self.status = status
+            self._changed.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stages": {
+                stage: ("done" if stage in self.results else "pending")
+                for stage in STAGES
+            },
+            "results": self.results,
+        }
+
+    async def stream(self, last_event_id: int = -1) -> AsyncIterator[str]:
+        """SSE frames: replays past events, then follows new ones until the job ends."""
+        cursor = last_event_id + 1
+        while True:
+            async with self._changed:
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: len(self.events) > cursor or self.finished),
+                        KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pending = []
+                else:
+                    pending = self.events[cursor:]
+                finished = self.finished
+
+            if not pending and not finished:
+                yield ": keep-alive\n\n"
+                continue
+
+            for event in pending:
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+            cursor += len(pending)
+
+            if finished and cursor >= len(self.events):
+                return
+
+
+def get_pipeline_job(job_id: str) -> Optional[PipelineJob]:
+    return _jobs.get(job_id)
+
+
+def start_resume_pipeline(
+    student: Dict,
+    file_path: str,
+    file_name: str,
+    content_hash: str,
+    save_images: bool = True,
+) -> PipelineJob:
+    job = PipelineJob(student["email"])
+    _jobs[job.id] = job
+    job.task = asyncio.create_task(_run(job, student, file_path, file_name, content_hash, save_images))
+    return job
+
+
+async def _stage(job: PipelineJob, name: str, coro) -> Any:
+    await job.emit("stage", {"stage": name, "status": "started"})
+    start = time.perf_counter()
+    result = await coro
+    elapsed_ms = int((time.perf_counter() - start) * 1000)
+    job.results[name] = result
+    await job.emit("stage", {"stage": name, "status": "done", "elapsed_ms": elapsed_ms, "result": result})
+    return result
+
+
+async def _extract(student: Dict, file_path: str, file_name: str, content_hash: str, save_images: bool) -> Dict:
+    email = student["email"]
+
+    # Same file as the current resume: keep its extraction and AI analysis
+    reupload_fields = reupload_update_fields(student, file_name, content_hash)
+    if reupload_fields:
+        await students_collection.update_one({"email": email}, {"$set": reupload_fields})
+        return {"file_name": file_name, **resume_upload_summary(student["resume"]), "reused": True}
+
+    extraction_result = await process_resume_upload(file_path, str(student["_id"]), content_hash, save_images)
+    resume_data = build_resume_document(file_name, content_hash, extraction_result)
+    await students_collection.update_one({"email": email}, {"$set": {"resume": resume_data}})
+
+    student["resume"] = resume_data
+    return {"file_name": file_name, **resume_upload_summary(resume_data), "reused": extraction_result["cached"]}
+
+
+async def _sections(student: Dict) -> Dict:
+    resume = student["resume"]
+
+    # Kept resume uploaded before local section detection: detect from the text
+    section_fields = section_backfill_fields(resume)
+    if section_fields:
+        await students_collection.update_one({"email": student["email"]}, {"$set": section_fields})
+
+    return {
+        "sections_found": resume.get("sections_found", []),
+        "missing_sections": resume.get("missing_sections", []),
+    }
+
+
+async def _analysis(student: Dict) -> Dict:
+    resume = student["resume"]
+    if not resume.get("raw_text"):
+        return {"skipped": True, "reason": "No text could be extracted from the PDF"}
+
+    analysis_key = resume_analysis_key(student, resume.get("content_hash"))
+    if can_reuse_analysis(resume, analysis_key):
+        return {**stored_resume_analysis(resume), "reused": True}
+
+    analysis_result = await analyze_resume_with_groq(student, resume["raw_text"], resume.get("section_outline"))
+    await students_collection.update_one(
+        {"email": student["email"]},
+        {"$set": analysis_update_fields(analysis_result, analysis_key)}
+    )
+    analysis_result["missing_sections"] = resume.get("missing_sections", [])
+    return analysis_result
+
+
+async def _prs(email: str) -> Dict:
+    student = await students_collection.find_one({"email": email}, {"password": 0})
+    prs_fields = prs_update_fields(student)
+    await students_collection.update_one({"email": email}, {"$set": prs_fields})
+    return prs_fields
+
+
+async def _run(job: PipelineJob, student: Dict, file_path: str, file_name: str, content_hash: str, save_images: bool):
+    job.status = "running"
+    stage = STAGES[0]
+    try:
+        await _stage(job, "extract", _extract(student, file_path, file_name, content_hash, save_images))
+        stage = "sections"
+        await _stage(job, "sections", _sections(student))
+        stage = "analysis"
+        await _stage(job, "analysis", _analysis(student))
+        stage = "prs"
+        await _stage(job, "prs", _prs(student["email"]))
+
+        await job.emit("complete", {"job_id": job.id}, status="completed")
+    except Exception as e:
+        print(f"Resume pipeline {job.id} failed at {stage}: {e}")
+        await job.emit("error", {"stage": stage, "message": str(e)}, status="failed")
+    finally:
+        asyncio.get_running_loop().call_later(JOB_RETENTION_SECONDS, _jobs.pop, job.id, None)
@@ -0,0 +1,126 @@
+"""
+resume_prompt.py — token-budgeted resume context for the Groq analysis.
+
+Instead of the first 4000 characters of raw_text, the prompt gets:
+
+  1. normalised text: icon glyphs, repeated whitespace, page furniture and
+     duplicate lines removed
+  2. boilerplate dropped (declarations, "references available on request")
+  3. sections (from the local detector's outline) ranked by how much they
+     tell the model about placement readiness, then packed into a token
+     budget measured with app.utils.tokenizer (a regex estimate until the
+     tokenizer is loaded; `tokenizer` in the result says which); a section
+     that doesn't fit is cut at a line boundary, never mid-line
+  4. the kept sections re-emitted in document order
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from app.config import RESUME_PROMPT_TOKEN_BUDGET
+from app.utils.tokenizer import count_tokens, tokenizer_name
+
+# Higher first. "Header" is the text before the first heading (name, contact).
+SECTION_PRIORITY = (
+    "Skills", "Projects", "Experience", "Education", "Summary", "Header",
+    "Certifications", "Achievements", "Publications", "Extracurricular",
+    "Languages", "Interests",
+)
+# The header is mostly contact details the profile already carries
+HEADER_TOKEN_CAP = 40
+# A truncated section is kept only if at least this many tokens of it fit
+MIN_PARTIAL_TOKENS = 30
+
+# Private-use glyphs (icon fonts), replacement chars and bullets
+_GLYPHS = re.compile("[\ue000-\uf8ff\ufffd\u2022\u25aa\u25cf\u27a2\u2023\u2043\u00b7]")
+_SPACES = re.compile("[ \t\u00a0]+")
+_PAGE_FURNITURE = re.compile(r"^(page \d+( of \d+)?|\d+ ?/ ?\d+|\d+)$", re.IGNORECASE)
+_BOILERPLATE = re.compile(
+    r"references? (are )?(available )?(up)?on request"
+    r"|i hereby declare"
+    r"|^declaration\b"
+    r"|true (and correct )?to the best of my knowledge",
+    re.IGNORECASE,
+)
+
+
+def normalize_lines(text: str) -> List[str]:
+    lines = []
+    seen = set()
+    for line in text.splitlines():
+        line = _SPACES.sub(" ", _GLYPHS.sub(" ", line)).strip(" -|")
+        if not line or _PAGE_FURNITURE.match(line) or _BOILERPLATE.search(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def _split_sections(raw_text: str, outline: Optional[List[Dict]]) -> List[Dict]:
+    """[{"name", "order", "lines"}] in document order."""
+    if not outline:
+        return [{"name": "Resume", "order": 0, "lines": normalize_lines(raw_text)}]
+
+    outline = sorted(outline, key=lambda s: s["start"])
+    sections = []
+    sections.append({"name": "Header", "order": 0, "lines": normalize_lines(raw_text[:outline[0]["start"]])})
+    for i, section in enumerate(outline, start=1):
+        sections.append({
+            "name": section["name"],
+            "order": i,
+            "lines": normalize_lines(raw_text[section["start"]:section["end"]]),
+        })
+    return [s for s in sections if s["lines"]]
+
+
+def _priority(name: str) -> int:
+    return SECTION_PRIORITY.index(name) if name in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+
+def build_resume_context(raw_text: str, outline: Optional[List[Dict]] = None, budget: int = RESUME_PROMPT_TOKEN_BUDGET) -> Dict:
+    """
+    Returns {"text", "tokens_raw", "tokens", "kept", "truncated", "dropped"}.
+    Without an outline the whole resume is one section cut to the budget.
+    """
+    sections = _split_sections(raw_text, outline)
+    remaining = budget
+    chosen: Dict[int, List[str]] = {}
+    truncated, dropped = [], []
+
+    for section in sorted(sections, key=lambda s: (_priority(s["name"]), s["order"])):
+        cap = min(remaining, HEADER_TOKEN_CAP) if section["name"] == "Header" else remaining
+        kept, used = [], 0
+        for line in section["lines"]:
+            cost = count_tokens(line) + 1  # newline
+            if used + cost > cap:
+                break
+            kept.append(line)
+            used += cost
+
+        if len(kept) == len(section["lines"]):
+            chosen[section["order"]] = kept
+        elif kept and (used >= MIN_PARTIAL_TOKENS or section["name"] == "Header"):
+            chosen[section["order"]] = kept
+            truncated.append(section["name"])
+        else:
+            dropped.append(section["name"])
+            continue
+        remaining -= used
+
+    text = "\n".join(
+        line
+        for section in sections if section["order"] in chosen
+        for line in chosen[section["order"]]
+    )
+    return {
+        "text": text,
+        "tokens_raw": count_tokens(raw_text),
+        "tokens": count_tokens(text),
+        "tokenizer": tokenizer_name(),
+        "kept": [s["name"] for s in sections if s["order"] in chosen],
+        "truncated": truncated,
+        "dropped": dropped,
+    }
@@ -0,0 +1,184 @@
+"""
+resume_rescore_service.py — campus-wide re-scoring of stored resume analyses.
+
+After a prompt change (RESUME_PROMPT_VERSION) or a model change (GROQ_MODEL)
+every stored resume_score / ats_score is stale. This job walks students with
+an extracted resume in `_id` order, skips those whose `resume.analysis_key`
+still matches (same resume bytes, profile, prompt version and model), re-runs
+the Groq analysis for the rest with bounded concurrency, recomputes PRS, and
+writes each batch back with one `bulk_write`.
+
+Progress and throughput are checkpointed in `job_checkpoints` after every
+batch, so a crashed run resumes where it stopped.
+
+Run via `python scripts/rescore_resumes.py` or trigger from the admin API.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.database import students_collection, job_checkpoints_collection
+from app.services.resume_service import (
+    analyze_resume_with_groq, resume_analysis_key, analysis_update_fields,
+    section_backfill_fields, prs_update_fields
+)
+
+DEFAULT_JOB_ID = "resume_rescore"
+
+# Jobs currently running in this process (a "running" checkpoint without an
+# entry here is a crashed run waiting to be resumed)
+_active_jobs = set()
+
+_QUERY = {
+    "role": {"$ne": "admin"},
+    "resume.raw_text": {"$nin": [None, ""]},
+}
+
+
+async def get_rescore_status(job_id: str = DEFAULT_JOB_ID) -> Optional[Dict]:
+    return await job_checkpoints_collection.find_one({"_id": job_id})
+
+
+def is_rescore_active(job_id: str = DEFAULT_JOB_ID) -> bool:
+    return job_id in _active_jobs
+
+
+async def _rescore_student(student: Dict, force: bool) -> Tuple[str, Optional[UpdateOne]]:
+    """Returns ("skipped" | "rescored" | "failed", pending update)."""
+    resume = student["resume"]
+    analysis_key = resume_analysis_key(student, resume.get("content_hash"))
+
+    if not force and analysis_key and resume.get("analysis_key") == analysis_key:
+        return "skipped", None
+
+    update_data = section_backfill_fields(resume)
+
+    analysis_result = await analyze_resume_with_groq(
+        student, resume["raw_text"], resume.get("section_outline"), refresh=force
+    )
+    if not analysis_result.get("resume_score"):
+        # Keep the old scores rather than overwrite them with a failed analysis
+        print(f"Resume re-score failed for {student.get('email')}: {analysis_result.get('suggestions')}")
+        return "failed", None
+
+    update_data.update(analysis_update_fields(analysis_result, analysis_key))
+
+    resume.update({
+        "resume_score": analysis_result.get("resume_score", 0),
+        "ats_score": analysis_result.get("ats_score", 0),
+    })
+    update_data.update(prs_update_fields(student))
+
+    return "rescored", UpdateOne({"_id": student["_id"]}, {"$set": update_data})
+
+
+async def rescore_resumes(
+    concurrency: int = 4,
+    job_id: str = DEFAULT_JOB_ID,
+    limit: Optional[int] = None,
+    restart: bool = False,
+    force: bool = False
+) -> Dict:
+    """
+    Re-scores stale resume analyses in `_id` order. Progress is checkpointed
+    after every batch; an unfinished checkpoint is resumed unless `restart`
+    is set. `force` re-scores even students whose analysis key is current.
+    """
+    if job_id in _active_jobs:
+        raise RuntimeError(f"{job_id} is already running")
+
+    _active_jobs.add(job_id)
+    try:
+        return await _run_rescore(concurrency, job_id, limit, restart, force)
+    finally:
+        _active_jobs.discard(job_id)
+
+
+async def _run_rescore(
+    concurrency: int,
+    job_id: str,
+    limit: Optional[int],
+    restart: bool,
+    force: bool
+) -> Dict:
+    checkpoint = await get_rescore_status(job_id)
+    resume = checkpoint and checkpoint.get("status") == "running" and not restart
+
+    if resume:
+        print(f"Resuming {job_id} after student {checkpoint.get('last_student_id')}")
+    else:
+        checkpoint = {
+            "_id": job_id,
+            "status": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "last_student_id": None,
+            "processed": 0,
+            "rescored": 0,
+            "skipped": 0,
+            "failed": 0,
+        }
+        await job_checkpoints_collection.replace_one({"_id": job_id}, checkpoint, upsert=True)
+
+    # Only what the prompt, the analysis key and PRS need
+    projection = {
+        "name": 1, "email": 1, "branch": 1, "year": 1, "skills": 1, "cgpa": 1,
+        "github_url": 1, "linkedin_url": 1, "github_analysis": 1,
+        "resume.raw_text": 1, "resume.content_hash": 1, "resume.analysis_key": 1,
+        "resume.section_outline": 1,
+    }
+    batch_size = max(1, concurrency)
+    semaphore = asyncio.Semaphore(batch_size)
+    run_started = time.monotonic()
+    run_processed = 0
+
+    async def limited(student):
+        async with semaphore:
+            try:
+                return await _rescore_student(student, force)
+            except Exception as e:
+                print(f"Resume re-score failed for {student.get('email')}: {e}")
+                return "failed", None
+
+    while limit is None or run_processed < limit:
+        # Re-query per batch (keyed on _id) so no cursor stays open across slow LLM calls
+        query = dict(_QUERY)
+        if checkpoint.get("last_student_id") is not None:
+            query["_id"] = {"$gt": checkpoint["last_student_id"]}
+
+        length = batch_size * 4 if limit is None else min(batch_size * 4, limit - run_processed)
+        batch = await students_collection.find(query, projection).sort("_id", 1).to_list(length=length)
+        if not batch:
+            break
+
+        results = await asyncio.gather(*[limited(s) for s in batch])
+
+        updates = [update for _, update in results if update is not None]
+        if updates:
+            await students_collection.bulk_write(updates, ordered=False)
+
+        run_processed += len(batch)
+        elapsed = time.monotonic() - run_started
+        checkpoint["last_student_id"] = batch[-1]["_id"]
+        checkpoint["processed"] += len(batch)
+        for outcome in ("rescored", "skipped", "failed"):
+            checkpoint[outcome] += sum(1 for o, _ in results if o == outcome)
+        checkpoint["throughput_per_min"] = round(run_processed / elapsed * 60, 2) if elapsed else 0.0
+        checkpoint["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        await job_checkpoints_collection.replace_one({"_id": job_id}, checkpoint, upsert=True)
+        print(
+            f"[{job_id}] processed={checkpoint['processed']} "
+            f"rescored={checkpoint['rescored']} skipped={checkpoint['skipped']} "
+            f"failed={checkpoint['failed']} "
+            f"throughput={checkpoint['throughput_per_min']}/min"
+        )
+
+    checkpoint["status"] = "completed"
+    checkpoint["finished_at"] = datetime.now(timezone.utc).isoformat()
+    await job_checkpoints_collection.replace_one({"_id": job_id}, checkpoint, upsert=True)
+
+    return checkpoint
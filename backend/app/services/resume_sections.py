@@ -0,0 +1,157 @@
+"""
+resume_sections.py — local section-heading detector for resumes.
+
+Finds headings such as Education / Projects / Experience / Skills without an
+LLM call, from two kinds of evidence:
+
+  - a heading lexicon (canonical section -> common wordings)
+  - PyMuPDF layout cues when available: a line set in a larger font than the
+    body text, in bold, or in ALL CAPS
+
+A short line that is exactly a lexicon entry (punctuation ignored) is a heading
+on its own; a styled line may also start with one and add up to
+PREFIX_EXTRA_WORDS words ("TECHNICAL SKILLS & TOOLS"). Single words that
+commonly open ordinary bold lines ("Project: ...", "Research Assistant",
+"Leadership Summit") only count as an exact match. Plain text (e.g. cached
+extractions) gets the lexicon + caps rules only.
+
+The result also carries an outline of character offsets into raw_text, which
+the prompt builder uses to work section by section.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+HEADING_LEXICON: Dict[str, Tuple[str, ...]] = {
+    "Summary": ("summary", "professional summary", "career objective", "objective", "profile", "about me", "about"),
+    "Education": ("education", "academic background", "academics", "educational qualifications", "qualifications"),
+    "Experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "internships", "internship", "internship experience", "work history",
+    ),
+    "Projects": ("projects", "academic projects", "personal projects", "key projects", "project work", "project"),
+    "Skills": (
+        "skills", "technical skills", "key skills", "core competencies", "technologies", "tech stack",
+        "tools and technologies", "skills and tools", "skill set", "technical proficiency",
+    ),
+    "Certifications": ("certifications", "certificates", "certification", "courses", "licenses and certifications"),
+    "Achievements": ("achievements", "awards", "honors", "honours", "accomplishments", "awards and achievements"),
+    "Publications": ("publications", "research", "research papers"),
+    "Extracurricular": (
+        "extracurricular activities", "extra curricular activities", "extracurricular", "activities",
+        "leadership", "positions of responsibility", "volunteering", "volunteer experience",
+    ),
+    "Languages": ("languages",),
+    "Interests": ("interests", "hobbies", "hobbies and interests"),
+}
+
+# Sections every placement resume is expected to have
+CORE_SECTIONS = ("Summary", "Education", "Skills", "Projects", "Experience")
+
+MAX_HEADING_WORDS = 6
+# Words a styled line may add after a lexicon wording it starts with
+PREFIX_EXTRA_WORDS = 2
+# Lexicon entries too generic to prefix-match a styled line
+EXACT_ONLY_VARIANTS = frozenset((
+    "project", "research", "leadership", "profile", "about", "activities", "courses", "languages",
+))
+LARGER_FONT_RATIO = 1.1
+BOLD_FLAG = 16  # PyMuPDF span flag bit
+
+_VARIANTS: Dict[str, str] = {
+    variant: canonical
+    for canonical, variants in HEADING_LEXICON.items()
+    for variant in variants
+}
+_MAX_VARIANT_WORDS = max(len(v.split()) for v in _VARIANTS)
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+
+
+def _normalize(text: str) -> str:
+    return _NON_LETTERS.sub(" ", text.lower().replace("&", " and ")).strip()
+
+
+def _lexicon_match(normalized: str, styled: bool) -> Optional[str]:
+    if normalized in _VARIANTS:
+        return _VARIANTS[normalized]
+    if not styled:
+        return None
+    # Styled lines may start with a known wording and add a few words
+    words = normalized.split()
+    for n in range(min(len(words), _MAX_VARIANT_WORDS), 0, -1):
+        if len(words) - n > PREFIX_EXTRA_WORDS:
+            break
+        prefix = " ".join(words[:n])
+        if prefix in EXACT_ONLY_VARIANTS:
+            continue
+        canonical = _VARIANTS.get(prefix)
+        if canonical:
+            return canonical
+    return None
+
+
+def _body_font_size(pages: List[List[Dict]]) -> Optional[float]:
+    sizes: Counter = Counter()
+    for lines in pages:
+        for line in lines:
+            for span in line["spans"]:
+                sizes[round(span.get("size", 0), 1)] += len(span.get("text", ""))
+    return sizes.most_common(1)[0][0] if sizes else None
+
+
+def _layout_lines(pages: List[List[Dict]]) -> List[Tuple[str, bool]]:
+    """(line text, has a style cue) for every line of the PyMuPDF pages."""
+    body = _body_font_size(pages)
+    lines = []
+    for page in pages:
+        for line in page:
+            spans = line["spans"]
+            size = max(span.get("size", 0) for span in spans)
+            bold = all(
+                span.get("flags", 0) & BOLD_FLAG or "bold" in span.get("font", "").lower()
+                for span in spans
+            )
+            larger = body is not None and size >= body * LARGER_FONT_RATIO
+            lines.append((line["text"], bold or larger))
+    return lines
+
+
+def detect_sections(raw_text: str, pages: Optional[List[List[Dict]]] = None) -> Dict:
+    """
+    Returns {"sections_found", "missing_sections", "section_outline"}.
+    `pages` are the per-page lines from pdf_extraction (optional).
+    `section_outline` lists {"name", "start", "end"} character ranges of raw_text.
+    """
+    candidates = _layout_lines(pages) if pages else [(line, False) for line in raw_text.splitlines()]
+
+    headings: List[Tuple[str, str]] = []
+    for text, styled in candidates:
+        stripped = text.strip().rstrip(":")
+        if not stripped or len(stripped.split()) > MAX_HEADING_WORDS:
+            continue
+        letters = [c for c in stripped if c.isalpha()]
+        caps = len(letters) > 2 and all(c.isupper() for c in letters)
+        canonical = _lexicon_match(_normalize(stripped), styled or caps)
+        if canonical:
+            headings.append((canonical, text.strip()))
+
+    # Locate headings in raw_text, in order, to build the outline
+    outline = []
+    cursor = 0
+    for canonical, heading in headings:
+        pos = raw_text.find(heading, cursor)
+        if pos < 0:
+            continue
+        if outline:
+            outline[-1]["end"] = pos
+        outline.append({"name": canonical, "start": pos, "end": len(raw_text)})
+        cursor = pos + len(heading)
+
+    found = list(dict.fromkeys(canonical for canonical, _ in headings))
+    return {
+        "sections_found": found,
+        "missing_sections": [s for s in CORE_SECTIONS if s not in found],
+        "section_outline": outline,
+    }
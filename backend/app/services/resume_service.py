@@ -1,20 +1,62 @@
 import os
 import re
-import io
 import json
-import fitz  # PyMuPDF
-import pandas as pd
-from pdfminer.high_level import extract_text
-from PIL import Image
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from functools import partial
 from typing import Dict, List, Any, Optional
-import tabula
-from groq import Groq
 
-UPLOAD_DIR_IMAGES = "uploads/resume_images/"
+from app.config import GROQ_MODEL
+from app.services.extraction_pool import run_extraction, ExtractionQueueFull, ExtractionTimeout
+from app.services.llm_cache import cached_completion
+from app.services.llm_gateway import chat_completion
+from app.services.prs_service import calculate_prs
+from app.services.resume_cache import get_cached_extraction, store_extraction
+from app.services.resume_images import IMAGE_STORE_DIR
+from app.services.resume_prompt import build_resume_context
+from app.services.resume_sections import detect_sections
+from app.services.table_extraction import active_table_backend, extract_tables
+
+# Bump when the analysis prompt changes so stored analyses are recomputed
+RESUME_PROMPT_VERSION = 3
+
 
-async def analyze_resume_with_groq(student_profile: Dict, resume_text: str) -> Dict[str, Any]:
+def build_profile_summary(student_profile: Dict) -> str:
+    return (
+        f"Name: {student_profile.get('name')}\n"
+        f"Branch: {student_profile.get('branch')}\n"
+        f"Year: {student_profile.get('year')}\n"
+        f"Skills: {', '.join(student_profile.get('skills', []))}\n"
+        f"CGPA: {student_profile.get('cgpa')}\n"
+        f"GitHub: {student_profile.get('github_url')}\n"
+        f"LinkedIn: {student_profile.get('linkedin_url')}\n"
+    )
+
+
+def resume_analysis_key(student_profile: Dict, content_hash: Optional[str]) -> Optional[str]:
+    """
+    Identifies one AI analysis: same resume bytes + same profile + same prompt
+    version + same model give the same result, so a stored analysis with this
+    key is reused (and bulk re-scoring skips it).
+    """
+    if not content_hash:
+        return None
+    material = f"v{RESUME_PROMPT_VERSION}|{GROQ_MODEL}|{content_hash}|{build_profile_summary(student_profile)}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+async def analyze_resume_with_groq(
+    student_profile: Dict,
+    resume_text: str,
+    section_outline: Optional[List[Dict]] = None,
+    refresh: bool = False
+) -> Dict[str, Any]:
     """
     Sends resume text + student profile to Groq for analysis.
+    The resume is packed section by section into RESUME_PROMPT_TOKEN_BUDGET
+    tokens (see resume_prompt) instead of a character cut.
+    Identical prompts are answered from the LLM cache unless `refresh` is set.
     Returns structured JSON with scores and suggestions.
     """
     api_key = os.getenv("GROQ_API_KEY")
@@ -29,20 +71,9 @@ async def analyze_resume_with_groq(student_profile: Dict, resume_text: str) -> D
             "short_summary": "Could not analyze."
         }
     
-    # Use AsyncGroq to prevent blocking event loop
-    from groq import AsyncGroq
-    client = AsyncGroq(api_key=api_key)
-    
     # Construct Context
-    profile_summary = (
-        f"Name: {student_profile.get('name')}\n"
-        f"Branch: {student_profile.get('branch')}\n"
-        f"Year: {student_profile.get('year')}\n"
-        f"Skills: {', '.join(student_profile.get('skills', []))}\n"
-        f"CGPA: {student_profile.get('cgpa')}\n"
-        f"GitHub: {student_profile.get('github_url')}\n"
-        f"LinkedIn: {student_profile.get('linkedin_url')}\n"
-    )
+    profile_summary = build_profile_summary(student_profile)
+    context = build_resume_context(resume_text, section_outline)
 
     prompt = f"""
     You are an expert ATS and Resume Analyzer for Campus Placements.
@@ -51,21 +82,19 @@ async def analyze_resume_with_groq(student_profile: Dict, resume_text: str) -> D
     {profile_summary}
     
     Resume Content (Extracted Text):
-    {resume_text[:4000]}  # Truncate to avoid context limit if needed
+    {context["text"]}
     
     Task:
     1. Compare the Student Profile with the Resume.
     2. Rate the resume quality (0-100).
     3. Rate ATS compatibility (0-100).
-    4. Identify missing sections (e.g., Projects, Skills, Education).
-    5. Find mismatches between Profile and Resume (e.g., skill listed in profile but not in resume).
-    6. Suggest 3-5 concrete improvements.
+    4. Find mismatches between Profile and Resume (e.g., skill listed in profile but not in resume).
+    5. Suggest 3-5 concrete improvements.
     
     Return STRICT JSON format ONLY:
     {{
       "resume_score": <int>,
       "ats_score": <int>,
-      "missing_sections": ["section1", "section2"],
       "detected_skills": ["skill1", "skill2"],
       "profile_mismatches": ["mismatch1", "mismatch2"],
       "improvement_suggestions": ["tip1", "tip2", "tip3"],
@@ -74,18 +103,19 @@ async def analyze_resume_with_groq(student_profile: Dict, resume_text: str) -> D
     """
 
     try:
-        completion = await client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+        # An unchanged resume + profile is answered from the LLM cache
+        return await cached_completion(
+            partial(chat_completion, "resume_analysis"),
+            json.loads,
+            model=GROQ_MODEL,
             messages=[
                 {"role": "system", "content": "You are a helpful AI career coach. Output JSON only."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            refresh=refresh
         )
-        
-        response_content = completion.choices[0].message.content
-        return json.loads(response_content)
 
     except Exception as e:
         print(f"Groq Analysis Failed: {e}")
@@ -99,57 +129,6 @@ async def analyze_resume_with_groq(student_profile: Dict, resume_text: str) -> D
         }
 
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extracts raw text from PDF using pdfminer.six."""
-    try:
-        text = extract_text(file_path)
-        return text if text else ""
-    except Exception as e:
-        print(f"Error extracting text: {e}")
-        return ""
-
-def extract_images_from_pdf(file_path: str, student_id: str) -> int:
-    """Extracts images using PyMuPDF + Pillow and saves them."""
-    try:
-        doc = fitz.open(file_path)
-        image_count = 0
-        
-        # specific folder for this student
-        student_img_dir = os.path.join(UPLOAD_DIR_IMAGES, student_id)
-        os.makedirs(student_img_dir, exist_ok=True)
-
-        for i in range(len(doc)):
-            for img in doc.get_page_images(i):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                
-                # Use Pillow to save
-                image = Image.open(io.BytesIO(image_bytes))
-                image_filename = f"page{i+1}_img{xref}.{base_image['ext']}"
-                image.save(os.path.join(student_img_dir, image_filename))
-                image_count += 1
-                
-        return image_count
-    except Exception as e:
-        print(f"Error extracting images: {e}")
-        return 0
-
-def extract_tables_from_pdf(file_path: str) -> List[Dict[str, Any]]:
-    """Extracts tables using tabula-py. Fallback if Java is missing."""
-    try:
-        # Returns list of DataFrames
-        # multiple_tables=True returns a list of DataFrames
-        dfs = tabula.read_pdf(file_path, pages="all", multiple_tables=True)
-        tables = []
-        for df in dfs:
-            # Convert NaN to None/null for valid JSON
-            tables.append(df.where(pd.notnull(df), None).to_dict(orient="records"))
-        return tables
-    except Exception as e:
-        print(f"Tabula extraction failed (Java might be missing?): {e}")
-        return []
-
 def parse_contact_info(text: str) -> Dict[str, Any]:
     """Basic regex parsing for contact info."""
     email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
@@ -170,26 +149,176 @@ def parse_contact_info(text: str) -> Dict[str, Any]:
         "linkedin_links": list(set(linkedins))
     }
 
-import asyncio
 
-async def process_resume_upload(file_path: str, student_id: str) -> Dict[str, Any]:
-    """Orchestrates the resume extraction pipeline. Runs blocking I/O in threads."""
-    
-    # 1. Text Extraction (Blocking)
-    raw_text = await asyncio.to_thread(extract_text_from_pdf, file_path)
-    
-    # 2. Image Extraction (Blocking)
-    images_extracted = await asyncio.to_thread(extract_images_from_pdf, file_path, student_id)
-    
-    # 3. Table Extraction (Blocking - Java process)
-    tables = await asyncio.to_thread(extract_tables_from_pdf, file_path)
-    
-    # 4. Regex parsing (CPU bound but fast, still good to offload if text is huge)
-    contact_info = await asyncio.to_thread(parse_contact_info, raw_text)
-    
+def build_resume_document(file_name: str, content_hash: str, extraction_result: Dict[str, Any]) -> Dict[str, Any]:
+    """The `resume` sub-document stored for a freshly extracted upload."""
     return {
-        "raw_text": raw_text,
-        "images_extracted": images_extracted,
-        "tables": tables,
-        "contact_info": contact_info
+        "file_name": file_name,
+        "uploaded_at": datetime.now(timezone.utc).isoformat(),
+        "content_hash": content_hash,
+        "raw_text": extraction_result["raw_text"],
+        "tables": extraction_result["tables"],
+        "images_extracted": extraction_result["images_extracted"],
+        "images": extraction_result.get("images") or [],
+        # Detected locally from layout cues + heading lexicon
+        "sections_found": extraction_result["sections_found"],
+        "missing_sections": extraction_result["missing_sections"],
+        "section_outline": extraction_result["section_outline"],
+        "resume_score": 0,
+        "ats_score": 0,
+        "profile_resume_match_score": 0,
+        "profile_mismatches": [],
+        "suggestions": [],
+        "last_analyzed_at": None,
+        # Store contact info found via regex as validation metadata if needed
+        "contact_info": extraction_result["contact_info"]
     }
+
+
+def resume_upload_summary(resume: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "raw_text_preview": resume.get("raw_text", "")[:200] + "...",
+        "images_extracted": resume.get("images_extracted", 0),
+        "tables_extracted": len(resume.get("tables") or []),
+        "sections_found": resume.get("sections_found", []),
+        "missing_sections": resume.get("missing_sections", []),
+    }
+
+
+def analysis_update_fields(analysis_result: Dict[str, Any], analysis_key: Optional[str]) -> Dict[str, Any]:
+    """`$set` fields for storing a Groq analysis on the student's resume."""
+    update_data = {
+        "resume.resume_score": analysis_result.get("resume_score", 0),
+        "resume.ats_score": analysis_result.get("ats_score", 0),
+        "resume.profile_mismatches": analysis_result.get("profile_mismatches", []),
+        "resume.suggestions": analysis_result.get("improvement_suggestions", []),
+        "resume.detected_skills": analysis_result.get("detected_skills", []),
+        "resume.short_summary": analysis_result.get("short_summary", ""),
+        "resume.last_analyzed_at": datetime.now(timezone.utc).isoformat()
+    }
+    # Failed analyses (no scores) are not marked reusable
+    if analysis_key and analysis_result.get("resume_score"):
+        update_data["resume.analysis_key"] = analysis_key
+    return update_data
+
+
+def stored_resume_analysis(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """The last stored analysis, in the shape analyze_resume_with_groq returns."""
+    return {
+        "resume_score": resume.get("resume_score", 0),
+        "ats_score": resume.get("ats_score", 0),
+        "missing_sections": resume.get("missing_sections", []),
+        "detected_skills": resume.get("detected_skills", []),
+        "profile_mismatches": resume.get("profile_mismatches", []),
+        "improvement_suggestions": resume.get("suggestions", []),
+        "short_summary": resume.get("short_summary", "")
+    }
+
+
+def can_reuse_analysis(resume: Dict[str, Any], analysis_key: Optional[str]) -> bool:
+    return bool(analysis_key and resume.get("analysis_key") == analysis_key and resume.get("last_analyzed_at"))
+
+
+def reupload_update_fields(student: Dict, file_name: str, content_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    `$set` fields when the upload is the student's current resume again (same
+    bytes, already extracted): its extraction and AI analysis are kept. None
+    for a new resume.
+    """
+    previous = student.get("resume") or {}
+    if previous.get("content_hash") != content_hash or not previous.get("raw_text"):
+        return None
+    return {
+        "resume.file_name": file_name,
+        "resume.uploaded_at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def section_backfill_fields(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resumes stored before local section detection: detects the sections from
+    raw_text, updates `resume` in place and returns the `$set` fields ({} when
+    the resume already has an outline).
+    """
+    if "section_outline" in resume:
+        return {}
+    sections = detect_sections(resume["raw_text"])
+    resume.update(sections)
+    return {f"resume.{k}": v for k, v in sections.items()}
+
+
+def prs_update_fields(student: Dict) -> Dict[str, Any]:
+    """PRS for the student as `$set` fields (also the API's response shape)."""
+    prs_result = calculate_prs(student)
+    return {
+        "prs_score": prs_result["prs_score"],
+        "prs_level": prs_result["prs_level"],
+        "prs_breakdown": prs_result["breakdown"]
+    }
+
+
+async def process_resume_upload(
+    file_path: str,
+    student_id: str,
+    content_hash: Optional[str] = None,
+    save_images: bool = True,
+) -> Dict[str, Any]:
+    """
+    Orchestrates the resume extraction pipeline.
+    With a `content_hash`, the content-addressed extraction cache is checked
+    first (same bytes uploaded before, by anyone). Otherwise the PDF is parsed
+    once (text, images and table candidates on a single PyMuPDF handle) in the
+    extraction process pool. With `save_images=False` embedded images are only
+    counted, not stored.
+    Raises ExtractionQueueFull / ExtractionTimeout from the pool.
+    """
+    if content_hash:
+        cached = await get_cached_extraction(content_hash)
+        # A count-only entry can't serve a request that wants the images stored
+        if cached and (cached.get("images") is not None or not save_images):
+            return {**cached, "cached": True}
+
+    table_backend = active_table_backend()
+
+    try:
+        if table_backend == "tabula":
+            # Tables come from the warm JVM, concurrently with the PyMuPDF pass
+            extracted, tables = await asyncio.gather(
+                run_extraction(file_path, IMAGE_STORE_DIR, with_tables=False, save_images=save_images),
+                extract_tables(file_path)
+            )
+            extracted["tables"] = tables
+        else:
+            extracted = await run_extraction(
+                file_path, IMAGE_STORE_DIR,
+                with_tables=table_backend == "layout",
+                save_images=save_images
+            )
+    except (ExtractionQueueFull, ExtractionTimeout):
+        raise
+    except Exception as e:
+        print(f"Error extracting resume: {e}")
+        extracted = None
+
+    if extracted is None:
+        return {
+            "raw_text": "", "images_extracted": 0, "images": [], "tables": [],
+            "contact_info": parse_contact_info(""), **detect_sections(""), "cached": False
+        }
+
+    # Regex parsing (CPU bound but fast, still good to offload if text is huge)
+    contact_info = await asyncio.to_thread(parse_contact_info, extracted["raw_text"])
+
+    result = {
+        "raw_text": extracted["raw_text"],
+        "images_extracted": extracted["images_extracted"],
+        "images": extracted["images"],
+        "tables": extracted["tables"],
+        "contact_info": contact_info,
+        # Local heading detection (sub-millisecond), from the layout cues
+        **detect_sections(extracted["raw_text"], extracted.get("pages"))
+    }
+    if content_hash:
+        await store_extraction(content_hash, result)
+
+    return {**result, "cached": False}
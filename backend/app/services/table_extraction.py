@@ -0,0 +1,97 @@
+"""
+table_extraction.py — long-lived table-extraction backend for resumes.
+
+`tabula.read_pdf` used to start a fresh Java subprocess for every upload
+(seconds of JVM startup and a few hundred MB each time). RESUME_TABLE_BACKEND
+selects what runs instead:
+
+  - "layout" (default): the pure-Python geometry detector in pdf_extraction,
+    run inside the single PyMuPDF pass (no extra work here)
+  - "tabula": tabula in-process through jpype. One JVM is started at app
+    startup and kept warm; calls are serialised through a single executor
+    thread and bounded by RESUME_TABLE_TIMEOUT. Needs `jpype1` installed;
+    without it (or without Java) the layout detector is used.
+  - "off": no table extraction
+"""
+
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.config import RESUME_TABLE_BACKEND, RESUME_TABLE_TIMEOUT
+
+# The JVM is not fork-safe and tabula calls are not re-entrant: one thread owns it
+_jvm_executor: Optional[ThreadPoolExecutor] = None
+_tabula_ready = False
+
+
+def active_table_backend() -> str:
+    """Backend actually in use ("tabula" degrades to "layout" if the JVM can't start)."""
+    if RESUME_TABLE_BACKEND == "tabula":
+        return "tabula" if _tabula_ready else "layout"
+    return RESUME_TABLE_BACKEND if RESUME_TABLE_BACKEND in ("layout", "off") else "layout"
+
+
+def _read_tables_tabula(file_path: str) -> List[List[Dict[str, Any]]]:
+    import pandas as pd
+    import tabula
+
+    dfs = tabula.read_pdf(file_path, pages="all", multiple_tables=True, force_subprocess=False)
+    return [df.where(pd.notnull(df), None).to_dict(orient="records") for df in dfs]
+
+
+def _warm_jvm():
+    import jpype  # noqa: F401  (without jpype tabula falls back to a subprocess per call)
+    import fitz
+
+    # One throwaway extraction starts the JVM and loads tabula's classes
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "warmup.pdf")
+        with fitz.open() as doc:
+            doc.new_page().insert_text((72, 72), "warm up")
+            doc.save(path)
+        _read_tables_tabula(path)
+
+
+async def start_table_backend():
+    global _jvm_executor, _tabula_ready
+    if RESUME_TABLE_BACKEND != "tabula":
+        return
+
+    _jvm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tabula-jvm")
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_jvm_executor, _warm_jvm)
+        _tabula_ready = True
+        print("Tabula JVM started")
+    except Exception as e:
+        print(f"Tabula backend unavailable, using layout tables: {e}")
+
+
+def shutdown_table_backend():
+    global _jvm_executor, _tabula_ready
+    if _jvm_executor is not None:
+        _jvm_executor.shutdown(wait=False, cancel_futures=True)
+        _jvm_executor = None
+    _tabula_ready = False
+
+
+async def extract_tables(file_path: str) -> List[List[Dict[str, Any]]]:
+    """
+    Tables through the warm JVM, or [] on timeout / failure.
+    Only meaningful when active_table_backend() == "tabula".
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_jvm_executor, _read_tables_tabula, file_path),
+            RESUME_TABLE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        print(f"Tabula extraction timed out after {RESUME_TABLE_TIMEOUT:.0f}s: {file_path}")
+        return []
+    except Exception as e:
+        print(f"Tabula extraction failed: {e}")
+        return []
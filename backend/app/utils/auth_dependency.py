@@ -1,4 +1,4 @@
-from fastapi import Header, HTTPException
+from fastapi import Depends, Header, HTTPException
 from app.utils.jwt_handler import decode_access_token
 
 
@@ -16,3 +16,9 @@ async def get_current_user(authorization: str = Header(None, alias="Authorizatio
         return payload
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+
+async def require_admin(current_user: dict = Depends(get_current_user)):
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -0,0 +1,72 @@
+"""
+tokenizer.py — token counts for the prompt budgets.
+
+  - tiktoken's cl100k_base (Llama 3's tokenizer is tiktoken based; it is a
+    close stand-in) is loaded once by load_tokenizer(), at startup in a worker
+    thread, from TOKENIZER_CACHE_DIR. Fill that cache at build time with
+    `python scripts/prewarm_tokenizer.py`; the app itself never downloads it,
+    so no request waits on the network for a BPE file
+  - until it is loaded (no tiktoken, empty cache) counts are a regex estimate;
+    tokenizer_name() / is_estimate() say which one produced a count, and the
+    prompt builders report it with their budgets
+"""
+
+import hashlib
+import os
+import re
+
+from app.config import TOKENIZER_CACHE_DIR
+
+ENCODING_NAME = "cl100k_base"
+# Where tiktoken fetches cl100k_base from; it caches the file as sha1(url)
+ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+
+# Rough BPE behaviour: words, numbers and single punctuation marks are tokens,
+# long words split every ~4 characters
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+_encoding = None
+
+
+def _cached_file() -> str:
+    return os.path.join(TOKENIZER_CACHE_DIR, hashlib.sha1(ENCODING_URL.encode()).hexdigest())
+
+
+def load_tokenizer(allow_download: bool = False) -> str:
+    """
+    Loads the encoding from the local cache (blocking; call it off the event
+    loop). Only `allow_download` (the prewarm script) may fetch it. Returns
+    tokenizer_name().
+    """
+    global _encoding
+    if _encoding is not None:
+        return tokenizer_name()
+
+    if not allow_download and not os.path.exists(_cached_file()):
+        print(f"Tokenizer cache empty ({TOKENIZER_CACHE_DIR}); token budgets are regex estimates")
+        return tokenizer_name()
+
+    try:
+        import tiktoken
+        os.environ["TIKTOKEN_CACHE_DIR"] = TOKENIZER_CACHE_DIR
+        _encoding = tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        print(f"Tokenizer load failed, token budgets are regex estimates: {e}")
+    return tokenizer_name()
+
+
+def count_tokens(text: str) -> int:
+    """Token count of `text` (tiktoken once loaded, regex estimate otherwise)."""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return sum(1 + (len(t) - 1) // 4 for t in _TOKEN_PATTERN.findall(text))
+
+
+def is_estimate() -> bool:
+    return _encoding is None
+
+
+def tokenizer_name() -> str:
+    return f"tiktoken/{ENCODING_NAME}" if _encoding is not None else "regex-estimate"
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import os
+from typing import Iterable
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+CHUNK_SIZE = 256 * 1024
+PDF_MAGIC = b"%PDF-"
+# The PDF header may be preceded by a few junk bytes
+MAGIC_SEARCH_WINDOW = 1024
+# Multipart boundaries, part headers and the other form fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"File exceeds {max_bytes / (1024 * 1024):g} MB limit"
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Caps the request body of the upload routes before FastAPI parses the
+    multipart form (which spools the whole file before the handler runs):
+    a declared Content-Length over the cap gets 413 without reading the body,
+    and a chunked or understated body gets 413 as soon as the cap is crossed.
+    """
+
+    def __init__(self, app, paths: Iterable[str], max_bytes: int):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+        self.max_body = max_bytes + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse(status_code=413, content={"detail": _too_large_detail(self.max_bytes)})
+        headers = dict(scope["headers"])
+        try:
+            declared = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            declared = 0
+        if declared > self.max_body:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    # HTTPException passes through FastAPI's form parsing unchanged
+                    raise HTTPException(status_code=413, detail=_too_large_detail(self.max_bytes))
+            return message
+
+        async def tracked_send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as e:
+            if e.status_code != 413 or started:
+                raise
+            await too_large(scope, receive, send)
+
+
+async def save_pdf_upload(file: UploadFile, dest_path: str, max_bytes: int) -> str:
+    """
+    Streams an uploaded PDF to `dest_path` in fixed-size chunks and returns its
+    SHA-256. Writing and hashing run in a worker thread, so the event loop
+    doesn't scale with the file size.
+    By the time the handler runs FastAPI has already spooled the upload
+    (memory up to 1 MB, then a temp file); the body is capped before that by
+    UploadSizeLimitMiddleware. This re-checks the file itself.
+    Raises 400 for non-PDF content and 413 once `max_bytes` is exceeded.
+    """
+    declared_size = getattr(file, "size", None)
+    if declared_size and declared_size > max_bytes:
+        raise HTTPException(status_code=413, detail=_too_large_detail(max_bytes))
+
+    digest = hashlib.sha256()
+    tmp_path = dest_path + ".part"
+    size = 0
+
+    def write_chunk(out, chunk):
+        digest.update(chunk)
+        out.write(chunk)
+
+    out = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            if size == 0 and PDF_MAGIC not in chunk[:MAGIC_SEARCH_WINDOW]:
+                raise HTTPException(status_code=400, detail="File is not a valid PDF")
+
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=_too_large_detail(max_bytes))
+
+            await asyncio.to_thread(write_chunk, out, chunk)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        await asyncio.to_thread(_remove_quietly, tmp_path)
+        raise
+
+    await asyncio.to_thread(out.close)
+    await asyncio.to_thread(os.replace, tmp_path, dest_path)
+    return digest.hexdigest()
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
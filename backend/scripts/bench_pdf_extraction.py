@@ -0,0 +1,112 @@
+"""
+Benchmark: legacy three-library resume extraction vs the single-parse extractor.
+
+Usage:
+    python scripts/bench_pdf_extraction.py [PDF files or directories ...] [--repeat N] [--skip-tabula]
+
+With no paths, every PDF under uploads/resumes/ is used. The legacy pipeline is
+pdfminer (text) + PyMuPDF/Pillow (images) + tabula (tables, one Java process
+per call); pass --skip-tabula on machines without Java.
+"""
+
+import argparse
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.pdf_extraction import extract_resume_pdf
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ---------------- Legacy pipeline (pre single-parse) ---------------- #
+def legacy_extract(file_path, image_dir, skip_tabula=False):
+    import fitz
+    from PIL import Image
+    from pdfminer.high_level import extract_text
+
+    raw_text = extract_text(file_path) or ""
+
+    os.makedirs(image_dir, exist_ok=True)
+    images = 0
+    doc = fitz.open(file_path)
+    for i in range(len(doc)):
+        for img in doc.get_page_images(i):
+            xref = img[0]
+            base_image = doc.extract_image(xref)
+            image = Image.open(io.BytesIO(base_image["image"]))
+            image.save(os.path.join(image_dir, f"page{i+1}_img{xref}.{base_image['ext']}"))
+            images += 1
+
+    tables = []
+    if not skip_tabula:
+        import pandas as pd
+        import tabula
+        try:
+            for df in tabula.read_pdf(file_path, pages="all", multiple_tables=True):
+                tables.append(df.where(pd.notnull(df), None).to_dict(orient="records"))
+        except Exception as e:
+            print(f"tabula failed: {e}")
+
+    return {"raw_text": raw_text, "images_extracted": images, "tables": tables}
+
+
+def collect_pdfs(paths):
+    files = []
+    for path in paths or [os.path.join(BACKEND_DIR, "uploads", "resumes")]:
+        if os.path.isfile(path):
+            files.append(path)
+        else:
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.pdf"), recursive=True)))
+    return files
+
+
+def bench(fn, files, repeat, image_dir):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for f in files:
+            fn(f, image_dir)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-tabula", action="store_true")
+    args = parser.parse_args()
+
+    files = collect_pdfs(args.paths)
+    if not files:
+        print("No PDF files found")
+        sys.exit(1)
+
+    image_dir = tempfile.mkdtemp(prefix="bench_resume_images_")
+    runs = len(files) * args.repeat
+    print(f"Corpus: {len(files)} PDFs, {args.repeat} repeats")
+
+    try:
+        legacy_s = bench(lambda f, d: legacy_extract(f, d, args.skip_tabula), files, args.repeat, image_dir)
+        unified_s = bench(extract_resume_pdf, files, args.repeat, image_dir)
+
+        label = "pdfminer + fitz" if args.skip_tabula else "pdfminer + fitz + tabula"
+        print(f"legacy ({label}): {legacy_s / runs * 1000:8.1f} ms/upload")
+        print(f"single-parse PyMuPDF: {unified_s / runs * 1000:8.1f} ms/upload")
+        print(f"speedup: {legacy_s / unified_s:.2f}x")
+
+        for f in files:
+            old = legacy_extract(f, image_dir, skip_tabula=True)
+            new = extract_resume_pdf(f, image_dir)
+            print(
+                f"  {os.path.basename(f)}: text {len(old['raw_text'])} -> {len(new['raw_text'])} chars, "
+                f"images {old['images_extracted']} -> {new['images_extracted']}, "
+                f"tables -> {len(new['tables'])}"
+            )
+    finally:
+        shutil.rmtree(image_dir, ignore_errors=True)
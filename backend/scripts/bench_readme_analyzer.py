@@ -0,0 +1,134 @@
+"""
+Micro-benchmark: legacy substring README analysis vs the single-pass scanner.
+
+Usage:
+    python scripts/bench_readme_analyzer.py [README files or directories ...] [--repeat N]
+
+With no paths, every *.md file in the repository is used as the corpus. For
+realistic numbers, point it at a directory of READMEs dumped from student repos.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.readme_analyzer import analyze_readme
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SKIP_DIRS = {"node_modules", ".git", ".next", "venv", ".venv", "__pycache__"}
+
+
+# ---------------- Legacy implementation (pre single-pass) ---------------- #
+def legacy_detect_project_type(languages, readme_text, repo_name, description):
+    text = (readme_text + " " + (description or "") + " " + repo_name).lower()
+    langs = [l.lower() for l in languages]
+
+    if "next.js" in text or "nextjs" in text:
+        return "Web Development Project"
+    if "react" in text:
+        return "Web Development Project"
+    if "firebase" in text:
+        return "Web Development Project"
+    if "arduino" in text or "esp32" in text or "iot" in text:
+        return "IoT / Embedded Project"
+    if "machine learning" in text or "random forest" in text or "tensorflow" in text:
+        return "Machine Learning Project"
+    if "java" in langs and "mysql" in text:
+        return "Java + Database Project"
+    if "matlab" in text:
+        return "MATLAB Simulation Project"
+    if "python" in langs:
+        return "Python Project"
+    if "java" in langs:
+        return "Java Project"
+    if "c++" in langs or "c" in langs:
+        return "C/C++ Project"
+    return "General Project"
+
+
+def legacy_extract_keywords(readme_text):
+    keywords = [
+        "react", "next", "node", "express", "mongodb", "mysql", "firebase",
+        "fastapi", "flask", "django", "api", "rest",
+        "arduino", "esp32", "iot",
+        "machine learning", "tensorflow", "pytorch",
+        "java", "python", "c++", "c", "matlab",
+        "tailwind", "bootstrap"
+    ]
+    lower_text = readme_text.lower()
+    return list(set(k for k in keywords if k in lower_text))
+
+
+def legacy_extract_links(readme_text):
+    links = []
+    for word in readme_text.split():
+        if word.startswith("http://") or word.startswith("https://"):
+            links.append(word.strip("()[]{}<>\"',"))
+    ignored = ("shields.io", "github-readme-stats", "streak-stats", "profile-trophy")
+    return list(set(l for l in links if not any(m in l for m in ignored)))[:5]
+
+
+def legacy_analyze(readme_text, languages, repo_name, description):
+    return {
+        "stack_detected": legacy_extract_keywords(readme_text),
+        "deployment_links": legacy_extract_links(readme_text),
+        "project_type": legacy_detect_project_type(languages, readme_text, repo_name, description),
+    }
+
+
+# ---------------- Corpus ---------------- #
+def load_corpus(paths):
+    files = []
+    for path in paths or [REPO_ROOT]:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            files.extend(os.path.join(root, n) for n in names if n.lower().endswith((".md", ".rst", ".txt")))
+
+    corpus = []
+    for f in files:
+        with open(f, encoding="utf-8", errors="ignore") as fh:
+            corpus.append((os.path.basename(os.path.dirname(f)) or "repo", fh.read()))
+    return corpus
+
+
+def bench(fn, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, text in corpus:
+            fn(text, ["Python", "JavaScript"], name, "")
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.paths)
+    if not corpus:
+        print("No README files found")
+        sys.exit(1)
+
+    total_chars = sum(len(t) for _, t in corpus)
+    runs = len(corpus) * args.repeat
+    print(f"Corpus: {len(corpus)} files, {total_chars / 1024:.1f} KiB, {args.repeat} repeats")
+
+    legacy_s = bench(legacy_analyze, corpus, args.repeat)
+    single_s = bench(analyze_readme, corpus, args.repeat)
+
+    print(f"legacy (substring x3 passes): {legacy_s / runs * 1e6:8.1f} µs/README")
+    print(f"single-pass scanner:          {single_s / runs * 1e6:8.1f} µs/README")
+    print(f"speedup: {legacy_s / single_s:.2f}x")
+
+    same_type = sum(
+        1 for name, text in corpus
+        if legacy_analyze(text, ["Python"], name, "")["project_type"] == analyze_readme(text, ["Python"], name, "")["project_type"]
+    )
+    print(f"project_type agreement with legacy: {same_type}/{len(corpus)}")
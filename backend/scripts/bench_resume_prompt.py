@@ -0,0 +1,89 @@
+"""
+Tokens sent to Groq per resume: legacy `raw_text[:4000]` vs the section-aware,
+token-budgeted context from resume_prompt.
+
+Usage:
+    python scripts/bench_resume_prompt.py [PDF/.txt files or directories ...] [--budget N]
+
+With no paths, every PDF under uploads/resumes/ is used. PDFs go through the
+upload extractor + local section detector; .txt files use text-only detection.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import RESUME_PROMPT_TOKEN_BUDGET
+from app.services.pdf_extraction import extract_resume_pdf
+from app.services.resume_prompt import build_resume_context
+from app.services.resume_sections import detect_sections
+from app.utils.tokenizer import count_tokens, load_tokenizer, tokenizer_name
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def collect(paths):
+    files = []
+    for path in paths or [os.path.join(BACKEND_DIR, "uploads", "resumes")]:
+        if os.path.isfile(path):
+            files.append(path)
+        else:
+            for ext in ("pdf", "txt"):
+                files.extend(sorted(glob.glob(os.path.join(path, "**", f"*.{ext}"), recursive=True)))
+    return files
+
+
+def load(path, image_dir):
+    if path.lower().endswith(".pdf"):
+        extracted = extract_resume_pdf(path, image_dir, save_images=False)
+        return extracted["raw_text"], detect_sections(extracted["raw_text"], extracted["pages"])
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+    return text, detect_sections(text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--budget", type=int, default=RESUME_PROMPT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    files = collect(args.paths)
+    if not files:
+        print("No resumes found")
+        sys.exit(1)
+
+    load_tokenizer()
+    print(f"Tokenizer: {tokenizer_name()}, budget: {args.budget} tokens")
+    legacy_total = new_total = 0
+    cut_mid_section = 0
+
+    with tempfile.TemporaryDirectory() as image_dir:
+        for path in files:
+            raw_text, sections = load(path, image_dir)
+            if not raw_text.strip():
+                print(f"  {os.path.basename(path)}: no text, skipped")
+                continue
+
+            legacy = count_tokens(raw_text[:4000])
+            context = build_resume_context(raw_text, sections["section_outline"], args.budget)
+            legacy_total += legacy
+            new_total += context["tokens"]
+            if len(raw_text) > 4000:
+                cut_mid_section += 1
+
+            print(
+                f"  {os.path.basename(path)}: {legacy:5d} -> {context['tokens']:5d} tokens"
+                f" (raw {context['tokens_raw']}), kept {context['kept']}"
+                + (f", truncated {context['truncated']}" if context["truncated"] else "")
+                + (f", dropped {context['dropped']}" if context["dropped"] else "")
+            )
+
+    if legacy_total:
+        saved = legacy_total - new_total
+        print(f"Total: {legacy_total} -> {new_total} tokens ({saved} saved, {saved / legacy_total:.1%})")
+        print(f"Resumes the legacy 4000-char cut would have truncated mid-text: {cut_mid_section}")
@@ -0,0 +1,66 @@
+"""
+Benchmark the resume table stage: tabula subprocess per call (old path),
+tabula through one warm JVM (jpype), and the pure-Python layout detector.
+
+Usage:
+    python scripts/bench_table_extraction.py [PDF files or directories ...] [--repeat N]
+
+With no paths, every PDF under uploads/resumes/ is used. Tabula variants are
+skipped when tabula-py / jpype1 / Java are not available.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+
+from app.services.pdf_extraction import _page_lines, detect_tables
+from scripts.bench_pdf_extraction import collect_pdfs
+
+
+def layout_tables(file_path):
+    tables = []
+    with fitz.open(file_path) as doc:
+        for page in doc:
+            tables.extend(detect_tables(_page_lines(page.get_text("dict"))))
+    return tables
+
+
+def tabula_tables(file_path, force_subprocess):
+    import tabula
+    return tabula.read_pdf(file_path, pages="all", multiple_tables=True, force_subprocess=force_subprocess)
+
+
+def bench(label, fn, files, repeat):
+    try:
+        fn(files[0])  # first call pays JVM startup for the warm variant
+    except Exception as e:
+        print(f"{label:<28} skipped ({e.__class__.__name__}: {e})")
+        return
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for f in files:
+            fn(f)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / (len(files) * repeat) * 1000:9.1f} ms/resume")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = collect_pdfs(args.paths)
+    if not files:
+        print("No PDF files found")
+        sys.exit(1)
+
+    print(f"Corpus: {len(files)} PDFs, {args.repeat} repeats")
+    bench("tabula (subprocess/call)", lambda f: tabula_tables(f, True), files, args.repeat)
+    bench("tabula (warm JVM, jpype)", lambda f: tabula_tables(f, False), files, args.repeat)
+    bench("layout detector", layout_tables, files, args.repeat * 10)
@@ -0,0 +1,23 @@
+"""
+Downloads tiktoken's cl100k_base into TOKENIZER_CACHE_DIR so the app can load
+it at startup without network access. Run once at build / deploy time.
+
+Usage:
+    python scripts/prewarm_tokenizer.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import TOKENIZER_CACHE_DIR
+from app.utils.tokenizer import load_tokenizer, is_estimate
+
+
+if __name__ == "__main__":
+    name = load_tokenizer(allow_download=True)
+    if is_estimate():
+        print(f"Error: tokenizer could not be cached in {TOKENIZER_CACHE_DIR}")
+        sys.exit(1)
+    print(f"✅ {name} cached in {TOKENIZER_CACHE_DIR}")
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.github_refresh_service import refresh_stale_github_analyses, DEFAULT_JOB_ID
+from app.services.github_transport import close_github_client
+
+
+async def main(args):
+    print("--- Refreshing stale GitHub analyses ---")
+    try:
+        result = await refresh_stale_github_analyses(
+            max_age_hours=args.max_age_hours,
+            concurrency=args.concurrency,
+            job_id=args.job_id,
+            limit=args.limit,
+            restart=args.restart
+        )
+    finally:
+        await close_github_client()
+
+    print(
+        f"✅ Done: processed={result['processed']} succeeded={result['succeeded']} "
+        f"failed={result['failed']} throughput={result.get('throughput_per_min', 0)}/min"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Campus-wide GitHub analysis refresh")
+    parser.add_argument("--max-age-hours", type=float, default=24)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--job-id", default=DEFAULT_JOB_ID)
+    parser.add_argument("--restart", action="store_true", help="Ignore an unfinished checkpoint")
+    args = parser.parse_args()
+
+    try:
+        if sys.platform == 'win32':
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        asyncio.run(main(args))
+    except Exception as e:
+        print(f"Error: {e}")
@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.resume_rescore_service import rescore_resumes, DEFAULT_JOB_ID
+
+
+async def main(args):
+    print("--- Re-scoring stale resume analyses ---")
+    result = await rescore_resumes(
+        concurrency=args.concurrency,
+        job_id=args.job_id,
+        limit=args.limit,
+        restart=args.restart,
+        force=args.force
+    )
+
+    print(
+        f"✅ Done: processed={result['processed']} rescored={result['rescored']} "
+        f"skipped={result['skipped']} failed={result['failed']} "
+        f"throughput={result.get('throughput_per_min', 0)}/min"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk resume re-scoring after a prompt or model change")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent LLM calls")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--job-id", default=DEFAULT_JOB_ID)
+    parser.add_argument("--restart", action="store_true", help="Ignore an unfinished checkpoint")
+    parser.add_argument("--force", action="store_true", help="Re-score even unchanged analyses")
+    args = parser.parse_args()
+
+    try:
+        if sys.platform == 'win32':
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        asyncio.run(main(args))
+    except Exception as e:
+        print(f"Error: {e}")
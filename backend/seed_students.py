@@ -19,6 +19,7 @@ db = client[DB_NAME]
 
 students_collection = db["students"]
 companies_collection = db["companies"]
+app_meta_collection = db["app_meta"]
 benchmarks_collection = db["benchmarks"]
 training_collection = db["training_recommendations"]
 
@@ -324,6 +325,13 @@ def seed_companies():
     companies_collection.insert_many(company_templates)
     print(f"Inserted {len(company_templates)} companies successfully.")
 
+    # Invalidates every student's cached company-match AI analysis
+    app_meta_collection.update_one(
+        {"_id": "companies_catalog"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
 
 def seed_benchmarks():
     print("Deleting old benchmarks...")